@@ -6,6 +6,8 @@ https://github.com/andrew-codechimp/HA-Label-State
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+
 from awesomeversion.awesomeversion import AwesomeVersion
 
 from homeassistant.config_entries import ConfigEntry
@@ -14,15 +16,39 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.typing import ConfigType
 
+from .aggregates import MatchCount, NumericAggregate
 from .const import (
+    CONF_AGGREGATES,
+    CONF_STATE_NOT,
+    CONF_STATE_TO,
+    CONF_STATE_TYPE,
+    CONFIG_MINOR_VERSION,
+    CONFIG_VERSION,
     DOMAIN,
     LOGGER,
     MIN_HA_VERSION,
     PLATFORMS,
+    StateTypes,
 )
+from .feed import MatchFeed
+from .services import async_setup_services
+from .stats import LabelStateStats
+from .websocket import async_setup_websocket
 
 CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
 
+type LabelStateConfigEntry = ConfigEntry[LabelStateData]
+
+
+@dataclass
+class LabelStateData:
+    """Runtime data of a label_state config entry."""
+
+    stats: LabelStateStats = field(default_factory=LabelStateStats)
+    aggregate: NumericAggregate | None = None
+    match_count: MatchCount = field(default_factory=MatchCount)
+    feed: MatchFeed = field(default_factory=MatchFeed)
+
 
 async def async_setup(
     hass: HomeAssistant,  # pylint: disable=unused-argument
@@ -39,14 +65,24 @@ async def async_setup(
         LOGGER.critical(msg)
         return False
 
+    async_setup_services(hass)
+    async_setup_websocket(hass)
+
     return True
 
 
-async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+async def async_setup_entry(hass: HomeAssistant, entry: LabelStateConfigEntry) -> bool:
     """Set up Min/Max from a config entry."""
+    entry.runtime_data = LabelStateData()
+    if entry.options.get(
+        CONF_STATE_TYPE
+    ) == StateTypes.NUMERIC_STATE and entry.options.get(CONF_AGGREGATES):
+        entry.runtime_data.aggregate = NumericAggregate()
+
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     entry.async_on_unload(entry.add_update_listener(config_entry_update_listener))
+    entry.async_on_unload(entry.runtime_data.feed.async_shutdown)
 
     return True
 
@@ -56,6 +92,31 @@ async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry)
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version > CONFIG_VERSION:
+        # Downgraded from a future version
+        return False
+
+    if entry.minor_version == 1:
+        # The state and not state options became lists of states
+        options = dict(entry.options)
+        for key in (CONF_STATE_TO, CONF_STATE_NOT):
+            if isinstance(value := options.get(key), str):
+                options[key] = [value]
+        hass.config_entries.async_update_entry(
+            entry, options=options, minor_version=CONFIG_MINOR_VERSION
+        )
+        LOGGER.debug(
+            "Migrated %s to version %s.%s",
+            entry.title,
+            entry.version,
+            entry.minor_version,
+        )
+
+    return True
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
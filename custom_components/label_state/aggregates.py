@@ -0,0 +1,155 @@
+"""Incremental aggregates of the entities selected by a label_state sensor."""
+
+from __future__ import annotations
+
+from bisect import bisect_left, insort
+from collections.abc import Callable
+from math import isfinite
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+
+class Aggregate:
+    """Notify listeners of changes to an aggregate."""
+
+    __slots__ = ("_listeners",)
+
+    def __init__(self) -> None:
+        """Initialize the aggregate."""
+        self._listeners: list[Callable[[], None]] = []
+
+    @callback
+    def async_add_listener(self, update_callback: Callable[[], None]) -> CALLBACK_TYPE:
+        """Listen for changes of the aggregates."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            self._listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_notify(self) -> None:
+        """Notify the listeners."""
+        for update_callback in tuple(self._listeners):
+            update_callback()
+
+
+class MatchCount(Aggregate):
+    """Count the entities matched by a sensor.
+
+    The count is taken from the size of the match set, so it is read
+    without building the entity lists.
+    """
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        """Initialize the count, unknown until the sensor is evaluated."""
+        super().__init__()
+        self.count: int | None = None
+
+    @callback
+    def async_set(self, count: int) -> None:
+        """Set the count, notifying the listeners if it changed."""
+        if count != self.count:
+            self.count = count
+            self._async_notify()
+
+
+class NumericAggregate(Aggregate):
+    """Aggregate the numeric states of the entities selected by a sensor.
+
+    Values are kept in a sorted list, so each update is a binary search and
+    min, max and median are read directly. The sum is kept running for the
+    mean. Listeners are only notified when the sensor writes its state, so
+    the aggregates follow the same update delay.
+    """
+
+    __slots__ = ("_dirty", "_sorted", "_total", "_values")
+
+    def __init__(self) -> None:
+        """Initialize the aggregate."""
+        super().__init__()
+        self._values: dict[str, float] = {}
+        self._sorted: list[float] = []
+        self._total = 0.0
+        self._dirty = False
+
+    @callback
+    def async_set(self, entity_id: str, value: float | None) -> None:
+        """Set the value of an entity, a value of None removes it.
+
+        nan and inf cannot be ordered or averaged, so remove it too.
+        """
+        if value is not None and not isfinite(value):
+            value = None
+        old_value = self._values.get(entity_id)
+        if value == old_value:
+            return
+
+        if old_value is not None:
+            self._discard(old_value)
+        if value is None:
+            del self._values[entity_id]
+        else:
+            self._values[entity_id] = value
+            insort(self._sorted, value)
+            self._total += value
+        self._dirty = True
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Remove the value of an entity."""
+        if (value := self._values.pop(entity_id, None)) is not None:
+            self._discard(value)
+            self._dirty = True
+
+    def _discard(self, value: float) -> None:
+        """Remove one occurrence of a value from the sorted values."""
+        del self._sorted[bisect_left(self._sorted, value)]
+        self._total -= value
+        if not self._sorted:
+            # Drop any floating point error left over from the running sum
+            self._total = 0.0
+
+    @property
+    def count(self) -> int:
+        """Return the number of numeric values."""
+        return len(self._sorted)
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the lowest value."""
+        return self._sorted[0] if self._sorted else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the highest value."""
+        return self._sorted[-1] if self._sorted else None
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the values."""
+        return self._total / len(self._sorted) if self._sorted else None
+
+    @property
+    def median(self) -> float | None:
+        """Return the median of the values."""
+        if not (values := self._sorted):
+            return None
+        middle = len(values) // 2
+        if len(values) % 2:
+            return values[middle]
+        return (values[middle - 1] + values[middle]) / 2
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners if any value changed since the last time."""
+        if not self._dirty:
+            return
+
+        self._dirty = False
+        self._async_notify()
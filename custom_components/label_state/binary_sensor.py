@@ -2,42 +2,93 @@
 
 from __future__ import annotations
 
-from homeassistant.components.binary_sensor import BinarySensorEntity
+import re
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from itertools import islice
+from math import isfinite
+from time import perf_counter
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.binary_sensor import (
+    PLATFORM_SCHEMA as BINARY_SENSOR_PLATFORM_SCHEMA,
+    BinarySensorEntity,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_ENTITY_ID,
+    ATTR_NAME,
+    CONF_ATTRIBUTE,
     CONF_NAME,
+    CONF_PLATFORM,
+    CONF_SENSORS,
     CONF_UNIQUE_ID,
-    STATE_UNAVAILABLE,
-    STATE_UNKNOWN,
 )
-from homeassistant.core import Event, EventStateChangedData, HomeAssistant, callback
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    CoreState,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    ServiceResponse,
+    callback,
+)
 from homeassistant.helpers import (
-    device_registry as dr,
+    config_validation as cv,
     entity_registry as er,
     label_registry as lr,
 )
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.entity_platform import (
     AddConfigEntryEntitiesCallback,
     AddEntitiesCallback,
 )
-from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
-from homeassistant.helpers.event import async_track_state_change_event
-from homeassistant.helpers.label_registry import EVENT_LABEL_REGISTRY_UPDATED
-from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType, VolDictType
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonValueType
+
+from . import LabelStateConfigEntry
+from .aggregates import MatchCount, NumericAggregate
 from .const import (
     ATTR_ENTITIES,
+    ATTR_ENTITY_COUNT,
     ATTR_ENTITY_NAMES,
     ATTR_LABEL_NAME,
+    ATTR_LABEL_STATE_ENTITY_ID,
+    ATTR_MATCHED,
+    ATTR_MATCHES,
+    ATTR_SINCE,
+    ATTR_VALUE,
+    CONF_INHERIT_LABELS,
     CONF_LABEL,
+    CONF_LABELS_ALL,
+    CONF_LABELS_NOT,
+    CONF_MAX_ENTITIES,
+    CONF_MAX_UPDATE_DELAY,
+    CONF_STARTUP_GRACE_PERIOD,
+    CONF_STATE_FOR,
     CONF_STATE_LOWER_LIMIT,
     CONF_STATE_NOT,
+    CONF_STATE_PATTERN,
     CONF_STATE_TO,
     CONF_STATE_TYPE,
     CONF_STATE_UPPER_LIMIT,
+    EVENT_ENTITY_CHANGED,
     LOGGER,
     StateTypes,
 )
+from .deadlines import DeadlineQueue
+from .expression import LabelExpression
+from .feed import MatchFeed
+from .hub import async_get_hub
+from .predicates import StateMatcher, compile_predicate
+from .state_table import StateTable, extract_state
+from .stats import LabelStateStats
 
 
 async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -45,20 +96,125 @@ async def config_entry_update_listener(hass: HomeAssistant, entry: ConfigEntry)
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+def _get_state_for(options: Mapping[str, Any]) -> timedelta | None:
+    """Get the duration entities need to match for, None if not set."""
+    if not (value := options.get(CONF_STATE_FOR)):
+        return None
+    return cv.time_period(value) or None
+
+
+def _state_pattern(value: Any) -> str:
+    """Validate a state pattern is a regular expression."""
+    pattern = cv.string(value)
+    try:
+        StateMatcher(None, pattern)
+    except re.error as err:
+        msg = f"Invalid state pattern: {err}"
+        raise vol.Invalid(msg) from err
+    return pattern
+
+
+SENSOR_OPTIONS: VolDictType = {
+    vol.Optional(CONF_NAME): cv.string,
+    vol.Optional(CONF_UNIQUE_ID): cv.string,
+    vol.Optional(CONF_LABEL): cv.string,
+    vol.Optional(CONF_LABELS_ALL): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_LABELS_NOT): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_INHERIT_LABELS): cv.boolean,
+    vol.Optional(CONF_ATTRIBUTE): cv.string,
+    vol.Optional(CONF_STATE_TYPE): vol.In(
+        [state_type.value for state_type in StateTypes]
+    ),
+    vol.Optional(CONF_STATE_TO): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_STATE_NOT): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(CONF_STATE_PATTERN): _state_pattern,
+    vol.Optional(CONF_STATE_LOWER_LIMIT): vol.Any(None, vol.Coerce(float)),
+    vol.Optional(CONF_STATE_UPPER_LIMIT): vol.Any(None, vol.Coerce(float)),
+    vol.Optional(CONF_STATE_FOR): cv.positive_time_period,
+    vol.Optional(CONF_MAX_UPDATE_DELAY): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=300)
+    ),
+    vol.Optional(CONF_STARTUP_GRACE_PERIOD): vol.All(
+        vol.Coerce(float), vol.Range(min=0, max=600)
+    ),
+    vol.Optional(CONF_MAX_ENTITIES): vol.All(vol.Coerce(int), vol.Range(min=1)),
+}
+
+# Options of a sensor that are not defaults for the others of its block
+SENSOR_IDENTITY = (CONF_NAME, CONF_UNIQUE_ID)
+
+
+def _require_label_and_state_type(config: ConfigType) -> ConfigType:
+    """Validate a sensor has a label and state type."""
+    for key in (CONF_LABEL, CONF_STATE_TYPE):
+        if key not in config:
+            msg = f"required key not provided: {key}"
+            raise vol.Invalid(msg, path=[key])
+    return config
+
+
+def _merge_sensor_defaults(config: ConfigType) -> ConfigType:
+    """Apply the options of a block to each of its sensors and validate them.
+
+    The name and unique_id of a block are not applied, each sensor needs
+    its own.
+    """
+    if CONF_SENSORS not in config:
+        return _require_label_and_state_type(config)
+
+    defaults = {
+        key: value
+        for key, value in config.items()
+        if key not in (CONF_PLATFORM, CONF_SENSORS, *SENSOR_IDENTITY)
+    }
+    sensors = []
+    for index, sensor_config in enumerate(config[CONF_SENSORS]):
+        try:
+            sensors.append(_require_label_and_state_type(defaults | sensor_config))
+        except vol.Invalid as err:
+            err.prepend([CONF_SENSORS, index])
+            raise
+    return {**config, CONF_SENSORS: sensors}
+
+
+PLATFORM_SCHEMA = vol.All(
+    BINARY_SENSOR_PLATFORM_SCHEMA.extend(
+        {
+            **SENSOR_OPTIONS,
+            vol.Optional(CONF_SENSORS): vol.All(
+                cv.ensure_list, [vol.Schema(SENSOR_OPTIONS)]
+            ),
+        }
+    ),
+    _merge_sensor_defaults,
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
-    config_entry: ConfigEntry,
+    config_entry: LabelStateConfigEntry,
     async_add_entities: AddConfigEntryEntitiesCallback,
 ) -> None:
     """Initialize label state config entry."""
 
     name: str | None = config_entry.options.get(CONF_NAME)
+    attribute: str | None = config_entry.options.get(CONF_ATTRIBUTE)
     label: str = config_entry.options[CONF_LABEL]
+    labels_all: list[str] | None = config_entry.options.get(CONF_LABELS_ALL)
+    labels_not: list[str] | None = config_entry.options.get(CONF_LABELS_NOT)
+    inherit_labels: bool = config_entry.options.get(CONF_INHERIT_LABELS, False)
     state_type: str = config_entry.options[CONF_STATE_TYPE]
-    state_to: str | None = config_entry.options.get(CONF_STATE_TO)
-    state_not: str | None = config_entry.options.get(CONF_STATE_NOT)
+    state_to: list[str] | None = config_entry.options.get(CONF_STATE_TO)
+    state_not: list[str] | None = config_entry.options.get(CONF_STATE_NOT)
+    state_pattern: str | None = config_entry.options.get(CONF_STATE_PATTERN)
     state_lower_limit: float | None = config_entry.options.get(CONF_STATE_LOWER_LIMIT)
     state_upper_limit: float | None = config_entry.options.get(CONF_STATE_UPPER_LIMIT)
+    state_for = _get_state_for(config_entry.options)
+    max_update_delay: float | None = config_entry.options.get(CONF_MAX_UPDATE_DELAY)
+    startup_grace_period: float | None = config_entry.options.get(
+        CONF_STARTUP_GRACE_PERIOD
+    )
+    max_entities: float | None = config_entry.options.get(CONF_MAX_ENTITIES)
     unique_id = config_entry.entry_id
 
     config_entry.async_on_unload(
@@ -70,13 +226,26 @@ async def async_setup_entry(
             LabelStateBinarySensor(
                 hass,
                 label,
+                labels_all,
+                labels_not,
+                inherit_labels,
                 name,
+                attribute,
                 state_type,
                 state_to,
                 state_not,
+                state_pattern,
                 state_lower_limit,
                 state_upper_limit,
+                state_for,
+                max_update_delay,
+                startup_grace_period,
+                max_entities,
                 unique_id,
+                stats=config_entry.runtime_data.stats,
+                aggregate=config_entry.runtime_data.aggregate,
+                match_count=config_entry.runtime_data.match_count,
+                feed=config_entry.runtime_data.feed,
             )
         ]
     )
@@ -88,30 +257,83 @@ async def async_setup_platform(
     async_add_entities: AddEntitiesCallback,
     discovery_info: DiscoveryInfoType | None = None,
 ) -> None:
-    """Set up the min/max/mean sensor."""
+    """Set up a label state sensor, or a list of them, from YAML."""
+    if CONF_SENSORS not in config:
+        async_add_entities([_sensor_from_config(hass, config)])
+        return
+
+    start = perf_counter()
+    sensor_configs: list[ConfigType] = config[CONF_SENSORS]
+    label_count = len({sensor_config[CONF_LABEL] for sensor_config in sensor_configs})
+    remaining = len(sensor_configs)
+
+    @callback
+    def sensor_added() -> None:
+        """Log the setup time once every sensor of the block is added."""
+        nonlocal remaining
+        remaining -= 1
+        if not remaining:
+            LOGGER.info(
+                "Set up %s label_state sensors for %s labels in %.1f ms",
+                len(sensor_configs),
+                label_count,
+                (perf_counter() - start) * 1000,
+            )
+
+    # Added together, so the sensors of a label share the subscriptions
+    # the hub makes for its first one
+    async_add_entities(
+        [
+            _sensor_from_config(hass, sensor_config, on_added=sensor_added)
+            for sensor_config in sensor_configs
+        ]
+    )
+
+
+def _sensor_from_config(
+    hass: HomeAssistant,
+    config: Mapping[str, Any],
+    on_added: CALLBACK_TYPE | None = None,
+) -> LabelStateBinarySensor:
+    """Create a label state sensor from its YAML configuration."""
     label: str = config[CONF_LABEL]
+    labels_all: list[str] | None = config.get(CONF_LABELS_ALL)
+    labels_not: list[str] | None = config.get(CONF_LABELS_NOT)
+    inherit_labels: bool = config.get(CONF_INHERIT_LABELS, False)
     name: str | None = config.get(CONF_NAME)
+    attribute: str | None = config.get(CONF_ATTRIBUTE)
     state_type: str = config[CONF_STATE_TYPE]
-    state_to: str | None = config.get(CONF_STATE_TO)
-    state_not: str | None = config.get(CONF_STATE_NOT)
+    state_to: str | list[str] | None = config.get(CONF_STATE_TO)
+    state_not: str | list[str] | None = config.get(CONF_STATE_NOT)
+    state_pattern: str | None = config.get(CONF_STATE_PATTERN)
     state_lower_limit: float | None = config.get(CONF_STATE_LOWER_LIMIT)
     state_upper_limit: float | None = config.get(CONF_STATE_UPPER_LIMIT)
+    state_for = _get_state_for(config)
+    max_update_delay: float | None = config.get(CONF_MAX_UPDATE_DELAY)
+    startup_grace_period: float | None = config.get(CONF_STARTUP_GRACE_PERIOD)
+    max_entities: float | None = config.get(CONF_MAX_ENTITIES)
     unique_id = config.get(CONF_UNIQUE_ID)
 
-    async_add_entities(
-        [
-            LabelStateBinarySensor(
-                hass,
-                label,
-                name,
-                state_type,
-                state_to,
-                state_not,
-                state_lower_limit,
-                state_upper_limit,
-                unique_id,
-            )
-        ]
+    return LabelStateBinarySensor(
+        hass,
+        label,
+        labels_all,
+        labels_not,
+        inherit_labels,
+        name,
+        attribute,
+        state_type,
+        state_to,
+        state_not,
+        state_pattern,
+        state_lower_limit,
+        state_upper_limit,
+        state_for,
+        max_update_delay,
+        startup_grace_period,
+        max_entities,
+        unique_id,
+        on_added=on_added,
     )
 
 
@@ -121,41 +343,103 @@ class LabelStateBinarySensor(BinarySensorEntity):
     _attr_icon = "mdi:tag"
     _attr_should_poll = False
 
-    _state_dict: dict[str, str] = {}
     _label_name: str = ""
 
     def __init__(
         self,
         hass: HomeAssistant,
         label: str,
+        labels_all: list[str] | None,
+        labels_not: list[str] | None,
+        inherit_labels: bool,
         name: str | None,
+        attribute: str | None,
         state_type: str,
-        state_to: str | None,
-        state_not: str | None,
+        state_to: str | list[str] | None,
+        state_not: str | list[str] | None,
+        state_pattern: str | None,
         state_lower_limit: float | None,
         state_upper_limit: float | None,
+        state_for: timedelta | None,
+        max_update_delay: float | None,
+        startup_grace_period: float | None,
+        max_entities: float | None,
         unique_id: str | None,
+        stats: LabelStateStats | None = None,
+        aggregate: NumericAggregate | None = None,
+        match_count: MatchCount | None = None,
+        feed: MatchFeed | None = None,
+        on_added: CALLBACK_TYPE | None = None,
     ) -> None:
         """Initialize the label state sensor."""
         self._attr_unique_id = unique_id
         self._label_id = label
-        self._state_type = state_type
-        self._state_to = state_to
-        self._state_not = state_not
-        self._state_lower_limit = state_lower_limit
-        self._state_upper_limit = state_upper_limit
+        self._labels = LabelExpression(
+            label, labels_all or (), labels_not or (), inherit=inherit_labels
+        )
+        self._predicate = compile_predicate(
+            state_type,
+            {
+                CONF_STATE_TO: state_to,
+                CONF_STATE_NOT: state_not,
+                CONF_STATE_PATTERN: state_pattern,
+                CONF_STATE_LOWER_LIMIT: state_lower_limit,
+                CONF_STATE_UPPER_LIMIT: state_upper_limit,
+            },
+        )
         self._attr_name = name
 
+        # Entities are matched on this attribute rather than their state
+        self._attribute = attribute or None
+
         self._unit_of_measurement_mismatch = False
 
+        # Entities only match once they have matched for the duration
+        self._state_for = state_for
+        self._deadlines: DeadlineQueue | None = None
+        if state_for:
+            self._deadlines = DeadlineQueue(hass, self._async_durations_passed)
+
+        # State changes within the delay are written as a single update
+        self._max_update_delay = max_update_delay
+        self._write_debouncer: Debouncer[None] | None = None
+        self._entities_changed = False
+
+        # Evaluation is deferred until Home Assistant has started and the
+        # grace period has passed
+        self._startup_grace_period = startup_grace_period
+        self._deferred = False
+        # The initial match set is a starting point, not a change
+        self._seeding = False
+
+        # The attributes only list the first entities of large match sets
+        self._max_entities = int(max_entities) if max_entities else None
+
+        self._hub = async_get_hub(hass)
+        self._on_added = on_added
+        self.stats = stats or LabelStateStats()
+        self._aggregate = aggregate
+        self._match_count = match_count
+
+        # Last match result of each labelled entity
+        self._states = StateTable(numeric=self._predicate.numeric)
+        # Matching entity_ids mapped to their display name, in match order,
+        # shared with the feed of the entry
+        self._feed = feed
+        self._entities_on: dict[str, str] = feed.entities if feed is not None else {}
+        # When each matching entity started matching
+        self._matched_since: dict[str, datetime] = {}
+
         self._attr_is_on = False
         self._attr_extra_state_attributes = {
             ATTR_ENTITIES: [],
             ATTR_ENTITY_NAMES: [],
             ATTR_LABEL_NAME: self._label_name,
         }
+        if self._max_entities is not None:
+            self._attr_extra_state_attributes[ATTR_ENTITY_COUNT] = 0
         self._unrecorded_attributes = frozenset(
-            {ATTR_ENTITIES, ATTR_ENTITY_NAMES, ATTR_LABEL_NAME}
+            {ATTR_ENTITIES, ATTR_ENTITY_COUNT, ATTR_ENTITY_NAMES, ATTR_LABEL_NAME}
         )
 
     async def async_added_to_hass(self) -> None:
@@ -168,249 +452,354 @@ class LabelStateBinarySensor(BinarySensorEntity):
         if label_entry is not None:
             self._label_name = label_entry.name
 
-        ent_reg = er.async_get(self.hass)
-        entries = er.async_entries_for_label(ent_reg, self._label_id)
-
-        for entity_entry in entries:
-            if entity_entry.entity_id == self.entity_id:
-                LOGGER.debug(
-                    "We don't watch ourself %s",
-                    entity_entry.entity_id,
-                )
-                continue
-            for label in entity_entry.labels:
-                if label == self._label_id:
-                    LOGGER.debug(
-                        "Found label %s in entity %s",
-                        self._label_id,
-                        entity_entry.entity_id,
-                    )
-
-                    # Replay current state of the labelled entitiy
-                    state = self.hass.states.get(entity_entry.entity_id)
-                    state_event: Event[EventStateChangedData] = Event(
-                        "",
-                        {
-                            "entity_id": entity_entry.entity_id,
-                            "new_state": state,
-                            "old_state": None,
-                        },
-                    )
-
-                    if entity_entry and self._label_id in entity_entry.labels:
-                        self._async_state_listener(state_event, update_state=False)
-
-                    self.async_on_remove(
-                        async_track_state_change_event(
-                            self.hass,
-                            entity_entry.entity_id,
-                            self._async_state_listener,
-                        )
-                    )
-
+        # State and registry changes are delivered by the hub, which
+        # subscribes each labelled entity once for all sensors of the label
         self.async_on_remove(
-            self.hass.bus.async_listen(
-                EVENT_LABEL_REGISTRY_UPDATED,
-                self._async_label_registry_modified,
+            self._hub.async_add_listener(
+                self._label_id, self, inherit=self._labels.inherit
             )
         )
 
-        self.async_on_remove(
-            self.hass.bus.async_listen(
-                EVENT_ENTITY_REGISTRY_UPDATED,
-                self._async_entity_registry_modified,
+        if self._max_update_delay:
+            self._write_debouncer = Debouncer(
+                self.hass,
+                LOGGER,
+                cooldown=self._max_update_delay,
+                immediate=False,
+                function=self._async_write_pending,
             )
-        )
+            self.async_on_remove(self._write_debouncer.async_shutdown)
+
+        if self._deadlines is not None:
+            self.async_on_remove(self._deadlines.async_shutdown)
+
+        if self._on_added is not None:
+            self._on_added()
+
+        if self.hass.state is CoreState.running:
+            self._async_evaluate()
+            return
+
+        # Ignore the labelled entities coming online during startup, the
+        # sensor is evaluated once from their states when it has finished
+        self._deferred = True
+        self._attr_is_on = None
+        self.async_on_remove(async_at_started(self.hass, self._async_hass_started))
+
+    @callback
+    def _async_hass_started(self, hass: HomeAssistant) -> None:
+        """Evaluate the sensor once the startup grace period has passed."""
+        if self._startup_grace_period:
+            self.async_on_remove(
+                async_call_later(
+                    hass, self._startup_grace_period, self._async_grace_period_over
+                )
+            )
+        else:
+            self._async_evaluate()
+
+    @callback
+    def _async_grace_period_over(self, _now: datetime) -> None:
+        """Evaluate the sensor at the end of the startup grace period."""
+        self._async_evaluate()
 
-        self._calc_state()
+    @callback
+    def _async_evaluate(self) -> None:
+        """Evaluate every labelled entity from its current state and write."""
+        self._deferred = False
+
+        # Seed the state table from the current states of the entities the
+        # hub subscribed, rather than replaying each one as a state change
+        states = self._hub.async_seed_states(self._label_id, self._attribute)
+        members = self._labels.async_members(self.hass, states)
+        self._seeding = True
+        for entity_id, state in states.items():
+            if entity_id not in members:
+                continue
+            if entity_id == self.entity_id:
+                LOGGER.debug(
+                    "We don't watch ourself %s",
+                    entity_id,
+                )
+                continue
+            self._update_entity_match(entity_id, state)
+        self._seeding = False
+
+        self._entities_changed = False
+        self._update_attributes(entities_changed=True)
         self.async_write_ha_state()
 
+        self._async_update_aggregates()
+
     @callback
-    def _async_label_registry_modified(
+    def async_label_registry_updated(
         self, event: Event[lr.EventLabelRegistryUpdatedData]
     ) -> None:
         """Handle label registry update."""
-        data = event.data
-        if data["action"] == "update" and data["label_id"] == self._label_id:
-            # Get the label, update the name
-            label_reg = lr.async_get(self.hass)
-            label_entry = label_reg.async_get_label(self._label_id)
-            if label_entry is not None:
-                self._label_name = label_entry.name
-
-            self._calc_state()
-            self.async_write_ha_state()
+        self.stats.registry_updates += 1
+
+        # Get the label, update the name
+        label_reg = lr.async_get(self.hass)
+        label_entry = label_reg.async_get_label(self._label_id)
+        if label_entry is not None:
+            self._label_name = label_entry.name
+
+        if not self._deferred:
+            self._async_schedule_write(entities_changed=False)
 
     @callback
-    def _async_entity_registry_modified(
+    def async_names_updated(self, entity_ids: set[str]) -> None:
+        """Handle the display names of entities changing."""
+        if self._deferred:
+            return
+
+        changed = False
+        for entity_id in entity_ids:
+            if entity_id in self._entities_on:
+                self._entities_on[entity_id] = self._hub.names.async_get(entity_id)
+                changed = True
+
+        if changed:
+            self._async_schedule_write(entities_changed=True)
+
+    @callback
+    def async_entity_registry_updated(
         self, event: Event[er.EventEntityRegistryUpdatedData]
     ) -> None:
-        """Handle entity registry update."""
+        """Handle an entity gaining, losing or being renamed with the label."""
+        if self._deferred:
+            return
+
+        self.stats.registry_updates += 1
+
         data = event.data
-        if data["action"] == "update" and data["changes"].get("labels") is not None:
-            # Get the entity, check it's current labels
-            entity_registry = er.async_get(self.hass)
-            entity_entry = entity_registry.async_get(data["entity_id"])
-
-            if entity_entry and self._label_id in entity_entry.labels:
-                if entity_entry.entity_id == self.entity_id:
-                    LOGGER.debug(
-                        "We don't watch ourself %s",
-                        entity_entry.entity_id,
-                    )
-                else:
-                    # The entity has a label, ensure we listen to it
-                    self.async_on_remove(
-                        async_track_state_change_event(
-                            self.hass,
-                            entity_entry.entity_id,
-                            self._async_state_listener,
-                        )
-                    )
-                    LOGGER.debug(
-                        "Found label %s in entity %s",
-                        self._label_id,
-                        entity_entry.entity_id,
-                    )
-
-            self._calc_state()
-            self.async_write_ha_state()
+        entity_id = data["entity_id"]
+        changed = False
+
+        if data["action"] == "update" and "old_entity_id" in data:
+            changed = self._remove_entity(data["old_entity_id"])
+
+        changed |= self._update_entity_membership(entity_id)
+        self._async_schedule_write(entities_changed=changed)
 
     @callback
-    def _async_state_listener(
-        self, event: Event[EventStateChangedData], update_state: bool = True
-    ) -> None:
+    def async_memberships_updated(self, entity_ids: set[str]) -> None:
+        """Handle the labels inherited by entities changing."""
+        if self._deferred:
+            return
+
+        self.stats.registry_updates += 1
+
+        changed = False
+        for entity_id in entity_ids:
+            changed |= self._update_entity_membership(entity_id)
+        self._async_schedule_write(entities_changed=changed)
+
+    @callback
+    def _update_entity_membership(self, entity_id: str) -> bool:
+        """Add or remove an entity by its labels, return True if the match set changed."""
+        entity_entry = er.async_get(self.hass).async_get(entity_id)
+        if (
+            entity_entry
+            and self._labels.matches(
+                self._labels.async_entity_labels(self.hass, entity_entry)
+            )
+            and entity_id != self.entity_id
+        ):
+            return self._update_entity_match(
+                entity_id,
+                extract_state(self.hass.states.get(entity_id), self._attribute),
+            )
+        return self._remove_entity(entity_id)
+
+    @callback
+    def async_state_changed(self, event: Event[EventStateChangedData]) -> None:
         """Handle the sensor state changes."""
-        entity_id = event.data["entity_id"]
-        new_state = event.data["new_state"]
+        if self._deferred:
+            return
+
+        data = event.data
+        entity_id = data["entity_id"]
+
+        if entity_id == self.entity_id:
+            LOGGER.debug(
+                "We don't watch ourself %s",
+                entity_id,
+            )
+            return
 
         LOGGER.debug("State changed for %s", entity_id)
 
-        # Store the state string in a dictionary keyed by the entity_id
-        self._state_dict[entity_id] = (
-            new_state.state if new_state is not None else STATE_UNKNOWN
+        start = perf_counter()
+        self.stats.events_processed += 1
+
+        # Only the changed entity needs evaluating, the rest of the match set
+        # is still valid. Registry updates keep the state table to the
+        # entities selected by the labels, so the others are ignored.
+        if entity_id in self._states:
+            state = extract_state(data["new_state"], self._attribute)
+            # Updates of the other attributes leave the watched one unchanged
+            if self._attribute is not None and state == extract_state(
+                data["old_state"], self._attribute
+            ):
+                self.stats.events_ignored += 1
+            else:
+                changed = self._update_entity_match(entity_id, state)
+                self._async_schedule_write(entities_changed=changed)
+
+        self.stats.state_change_latency.record(perf_counter() - start)
+
+    @callback
+    def _update_entity_match(self, entity_id: str, state: str) -> bool:
+        """Evaluate a single entity, return True if the match set changed."""
+        row = self._states.async_parse(state)
+        if self._aggregate is not None:
+            self._aggregate.async_set(entity_id, row.value)
+        match = self._predicate(row)
+        self._states.async_set_match(entity_id, match)
+
+        if match:
+            if entity_id in self._entities_on:
+                return False
+            if self._deadlines is not None and self._state_for is not None:
+                if entity_id in self._deadlines:
+                    return False
+                # Entities found by the first evaluation have been matching
+                # since their last change, not since the restart or reload
+                now = dt_util.utcnow()
+                since = self._async_seeded_since(entity_id) if self._seeding else None
+                deadline = (since or now) + self._state_for
+                if deadline > now:
+                    self._deadlines.async_add(entity_id, deadline)
+                    return False
+            self._async_match(entity_id)
+            return True
+
+        if self._deadlines is not None:
+            self._deadlines.async_remove(entity_id)
+        return self._async_unmatch(entity_id)
+
+    @callback
+    def _async_durations_passed(self, entity_ids: list[str]) -> None:
+        """Match the entities that have matched for the duration."""
+        # They started matching the duration before their deadline
+        since = dt_util.utcnow() - (self._state_for or timedelta())
+        for entity_id in entity_ids:
+            self._async_match(entity_id, since)
+        self._async_schedule_write(entities_changed=True)
+
+    @callback
+    def _async_match(self, entity_id: str, since: datetime | None = None) -> None:
+        """Add an entity to the match set, matching since now unless given."""
+        self._entities_on[entity_id] = self._hub.names.async_get(entity_id)
+        if since is None and self._seeding:
+            since = self._async_seeded_since(entity_id)
+        self._matched_since[entity_id] = since or dt_util.utcnow()
+        if self._feed is not None:
+            self._feed.async_matched(entity_id)
+        self._async_fire_entity_changed(entity_id, matched=True)
+
+    @callback
+    def _async_seeded_since(self, entity_id: str) -> datetime | None:
+        """Return when an entity found by the first evaluation started matching.
+
+        That is the last change of its state, or of any attribute when
+        matching an attribute, rather than the time of a restart or reload.
+        """
+        if (state := self.hass.states.get(entity_id)) is None:
+            return None
+        if self._attribute is not None:
+            return state.last_updated
+        return state.last_changed
+
+    @callback
+    def _async_unmatch(self, entity_id: str) -> bool:
+        """Remove an entity from the match set, return True if it was in it."""
+        if self._entities_on.pop(entity_id, None) is None:
+            return False
+        del self._matched_since[entity_id]
+        if self._feed is not None:
+            self._feed.async_unmatched(entity_id)
+        self._async_fire_entity_changed(entity_id, matched=False)
+        return True
+
+    @callback
+    def _async_fire_entity_changed(self, entity_id: str, *, matched: bool) -> None:
+        """Fire an event for an entity entering or leaving the match set."""
+        if self._seeding:
+            return
+
+        config_entry = self.platform.config_entry if self.platform else None
+        self.hass.bus.async_fire(
+            EVENT_ENTITY_CHANGED,
+            {
+                ATTR_CONFIG_ENTRY_ID: config_entry.entry_id if config_entry else None,
+                ATTR_LABEL_STATE_ENTITY_ID: self.entity_id,
+                ATTR_ENTITY_ID: entity_id,
+                ATTR_MATCHED: matched,
+            },
         )
 
-        self._calc_state()
+    @callback
+    def _remove_entity(self, entity_id: str) -> bool:
+        """Forget an entity, return True if it was in the match set."""
+        self._states.async_remove(entity_id)
+        if self._deadlines is not None:
+            self._deadlines.async_remove(entity_id)
+        if self._aggregate is not None:
+            self._aggregate.async_remove(entity_id)
+        return self._async_unmatch(entity_id)
 
-        if update_state:
+    @callback
+    def _async_schedule_write(self, *, entities_changed: bool) -> None:
+        """Write the state now, or at the end of the update delay."""
+        self._entities_changed |= entities_changed
+        if self._write_debouncer is not None:
+            self._write_debouncer.async_schedule_call()
+        else:
+            self._async_write_pending()
+
+    @callback
+    def _async_write_pending(self) -> None:
+        """Update the state and attributes from the pending changes and write.
+
+        Nothing is written when neither the state nor the attributes changed.
+        """
+        changed = self._update_attributes(entities_changed=self._entities_changed)
+        self._entities_changed = False
+        if changed:
+            self.stats.writes_emitted += 1
             self.async_write_ha_state()
+        else:
+            self.stats.writes_suppressed += 1
+
+        self._async_update_aggregates()
+
+    @callback
+    def _async_update_aggregates(self) -> None:
+        """Pass the written match set on to the aggregates and feed of the entry."""
+        if self._match_count is not None:
+            self._match_count.async_set(len(self._entities_on))
+        if self._aggregate is not None:
+            self._aggregate.async_update_listeners()
+        if self._feed is not None:
+            self._feed.async_flush()
 
     @callback
-    def _calc_state(self) -> None:
-        """Calculate the state."""
+    def _update_attributes(self, *, entities_changed: bool) -> bool:
+        """Update the state and attributes from the match set.
+
+        Returns True if the state or any attribute changed.
+        """
+        start = perf_counter()
+        self.stats.recomputes += 1
+        self.stats.tracked_entities = len(self._states)
 
         state_is_on: bool | None = False
-        entities_on: list[str] = []
-        entity_names: list[str] = []
-
-        entity_registry = er.async_get(self.hass)
-
-        if self._state_type == StateTypes.STATE:
-            for entity_id in self._state_dict.keys():
-                # Check if the state still has the label
-                entity_entry = entity_registry.async_get(entity_id)
-                if entity_entry and self._label_id in entity_entry.labels:
-                    entity_state = self._state_dict[entity_id]
-
-                    if (
-                        entity_state
-                        and self._state_to
-                        and entity_state.casefold() == self._state_to.casefold()
-                    ):
-                        state_is_on = True
-                        entities_on.append(entity_id)
-                        name = self._get_device_or_entity_name(entity_id)
-                        entity_names.append(name)
-
-        if self._state_type == StateTypes.NOT_STATE:
-            for entity_id in self._state_dict.keys():
-                # Check if the state still has the label
-                entity_entry = entity_registry.async_get(entity_id)
-                if entity_entry and self._label_id in entity_entry.labels:
-                    entity_state = self._state_dict[entity_id]
-
-                    if (
-                        entity_state
-                        and self._state_not
-                        and entity_state.casefold() != self._state_not.casefold()
-                    ):
-                        state_is_on = True
-                        entities_on.append(entity_id)
-                        name = self._get_device_or_entity_name(entity_id)
-                        entity_names.append(name)
-
-        if self._state_type == StateTypes.NUMERIC_STATE:
-            for entity_id in self._state_dict.keys():
-                # Check if the state still has the label
-                entity_entry = entity_registry.async_get(entity_id)
-                if entity_entry and self._label_id in entity_entry.labels:
-                    entity_state = self._state_dict[entity_id]
-
-                    try:
-                        if (
-                            entity_state
-                            and entity_state != STATE_UNKNOWN
-                            and entity_state != STATE_UNAVAILABLE
-                        ):
-                            if (
-                                self._state_lower_limit is not None
-                                and self._state_upper_limit is not None
-                            ):
-                                if (
-                                    float(entity_state) < self._state_lower_limit
-                                    or float(entity_state) > self._state_upper_limit
-                                ):
-                                    state_is_on = True
-                                    entities_on.append(entity_id)
-                                    name = self._get_device_or_entity_name(entity_id)
-                                    entity_names.append(name)
-
-                                    LOGGER.debug(
-                                        "State %s is below lower limit %s and above upper limit %s for %s",
-                                        entity_state,
-                                        self._state_lower_limit,
-                                        self._state_upper_limit,
-                                        entity_id,
-                                    )
-                            else:
-                                if (
-                                    self._state_lower_limit
-                                    and float(entity_state) < self._state_lower_limit
-                                ):
-                                    state_is_on = True
-                                    entities_on.append(entity_id)
-                                    name = self._get_device_or_entity_name(entity_id)
-                                    entity_names.append(name)
-
-                                    LOGGER.debug(
-                                        "State %s is below lower limit %s for %s",
-                                        entity_state,
-                                        self._state_lower_limit,
-                                        entity_id,
-                                    )
-
-                                if (
-                                    self._state_upper_limit
-                                    and float(entity_state) > self._state_upper_limit
-                                ):
-                                    state_is_on = True
-                                    entities_on.append(entity_id)
-                                    name = self._get_device_or_entity_name(entity_id)
-                                    entity_names.append(name)
-
-                                    LOGGER.debug(
-                                        "State %s is above upper limit %s for %s",
-                                        entity_state,
-                                        self._state_upper_limit,
-                                        entity_id,
-                                    )
-
-                    except ValueError:
-                        LOGGER.error(
-                            "Unable to determine state. Only numerical states are supported"
-                        )
-                        state_is_on = None
+        if self._entities_on:
+            state_is_on = True
+        elif self._states.invalid_count:
+            state_is_on = None
 
         LOGGER.debug(
             "State is %s for %s",
@@ -418,23 +807,61 @@ class LabelStateBinarySensor(BinarySensorEntity):
             self.entity_id,
         )
 
+        changed = state_is_on != self._attr_is_on
         self._attr_is_on = state_is_on
-        self._attr_extra_state_attributes[ATTR_ENTITIES] = entities_on
-        self._attr_extra_state_attributes[ATTR_ENTITY_NAMES] = entity_names
-        self._attr_extra_state_attributes[ATTR_LABEL_NAME] = self._label_name
 
-    def _get_device_or_entity_name(
-        self,
-        entity_id: str,
-    ) -> str:
-        """Get the device or entity name."""
-        entity_registry = er.async_get(self.hass)
-        entity_entry = entity_registry.async_get(entity_id)
-        if not entity_entry:
-            return entity_id
-        if entity_entry.device_id:
-            device_registry = dr.async_get(self.hass)
-            device_entry = device_registry.async_get(device_id=entity_entry.device_id)
-            if device_entry is not None:
-                return f"{device_entry.name_by_user or device_entry.name} ({entity_entry.name or entity_entry.original_name or entity_id})"
-        return entity_entry.name or entity_entry.original_name or entity_id
+        attributes = self._attr_extra_state_attributes
+
+        # The attribute lists are only rebuilt when the match set changes,
+        # listing the entities in the order they matched up to the maximum
+        if entities_changed:
+            limit = self._max_entities
+            entities = list(islice(self._entities_on, limit))
+            entity_names = list(islice(self._entities_on.values(), limit))
+            if (
+                entities != attributes[ATTR_ENTITIES]
+                or entity_names != attributes[ATTR_ENTITY_NAMES]
+            ):
+                attributes[ATTR_ENTITIES] = entities
+                attributes[ATTR_ENTITY_NAMES] = entity_names
+                changed = True
+            if limit is not None and attributes[ATTR_ENTITY_COUNT] != len(
+                self._entities_on
+            ):
+                attributes[ATTR_ENTITY_COUNT] = len(self._entities_on)
+                changed = True
+
+        if attributes[ATTR_LABEL_NAME] != self._label_name:
+            attributes[ATTR_LABEL_NAME] = self._label_name
+            changed = True
+
+        self.stats.update_latency.record(perf_counter() - start)
+        return changed
+
+    async def async_get_matches(
+        self, offset: int = 0, limit: int | None = None
+    ) -> ServiceResponse:
+        """Return a page of the matching entities, in match order.
+
+        The matches are read from the match set and their current states,
+        however many entities the attributes list.
+        """
+        stop = None if limit is None else offset + limit
+        matches: list[JsonValueType] = []
+        for entity_id, name in islice(self._entities_on.items(), offset, stop):
+            state = extract_state(self.hass.states.get(entity_id), self._attribute)
+            row = self._states.async_parse(state)
+            # nan and inf are returned as they were reported, not as JSON numbers
+            value: float | str = state
+            if row.value is not None and isfinite(row.value):
+                value = row.value
+            matches.append(
+                {
+                    ATTR_ENTITY_ID: entity_id,
+                    ATTR_NAME: name,
+                    ATTR_VALUE: value,
+                    ATTR_SINCE: self._matched_since[entity_id].isoformat(),
+                }
+            )
+
+        return {ATTR_ENTITY_COUNT: len(self._entities_on), ATTR_MATCHES: matches}
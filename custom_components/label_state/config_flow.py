@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import re
 from collections.abc import Callable, Coroutine, Mapping
 from typing import Any, cast
 
 import voluptuous as vol
 
+from homeassistant.const import CONF_ATTRIBUTE
 from homeassistant.helpers import selector
 from homeassistant.helpers.schema_config_entry_flow import (
     SchemaCommonFlowHandler,
@@ -17,15 +19,28 @@ from homeassistant.helpers.schema_config_entry_flow import (
 )
 
 from .const import (
+    CONF_AGGREGATES,
+    CONF_INHERIT_LABELS,
     CONF_LABEL,
+    CONF_LABELS_ALL,
+    CONF_LABELS_NOT,
+    CONF_MAX_ENTITIES,
+    CONF_MAX_UPDATE_DELAY,
+    CONF_STARTUP_GRACE_PERIOD,
+    CONF_STATE_FOR,
     CONF_STATE_LOWER_LIMIT,
     CONF_STATE_NOT,
+    CONF_STATE_PATTERN,
     CONF_STATE_TO,
     CONF_STATE_TYPE,
     CONF_STATE_UPPER_LIMIT,
+    CONFIG_MINOR_VERSION,
+    CONFIG_VERSION,
     DOMAIN,
+    AggregateTypes,
     StateTypes,
 )
+from .predicates import StateMatcher
 
 STATE_TYPES = ["numeric_state", "state", "state_not"]
 
@@ -36,10 +51,53 @@ STATE_OFF = "off"
 STATE_TO_OPTIONS = [STATE_TO_UNAVAILABLE, STATE_TO_UNKNOWN, STATE_ON, STATE_OFF]
 STATE_NOT_OPTIONS = [STATE_ON, STATE_OFF]
 
+LABELS_SELECTOR = selector.LabelSelector(
+    selector.LabelSelectorConfig(multiple=True),
+)
+
+MAX_UPDATE_DELAY_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=300,
+        step="any",
+        unit_of_measurement="s",
+        mode=selector.NumberSelectorMode.BOX,
+    ),
+)
+
+ATTRIBUTE_SELECTOR = selector.TextSelector(
+    selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+)
+
+STATE_PATTERN_SELECTOR = selector.TextSelector(
+    selector.TextSelectorConfig(type=selector.TextSelectorType.TEXT),
+)
+
+STARTUP_GRACE_PERIOD_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=0,
+        max=600,
+        step="any",
+        unit_of_measurement="s",
+        mode=selector.NumberSelectorMode.BOX,
+    ),
+)
+
+MAX_ENTITIES_SELECTOR = selector.NumberSelector(
+    selector.NumberSelectorConfig(
+        min=1,
+        step=1,
+        mode=selector.NumberSelectorMode.BOX,
+    ),
+)
 
 OPTIONS_SCHEMA_NUMERIC_STATE = vol.Schema(
     {
         vol.Required(CONF_LABEL): selector.LabelSelector(),
+        vol.Optional(CONF_LABELS_ALL): LABELS_SELECTOR,
+        vol.Optional(CONF_LABELS_NOT): LABELS_SELECTOR,
+        vol.Optional(CONF_INHERIT_LABELS): selector.BooleanSelector(),
+        vol.Optional(CONF_ATTRIBUTE): ATTRIBUTE_SELECTOR,
         vol.Optional(CONF_STATE_LOWER_LIMIT): selector.NumberSelector(
             selector.NumberSelectorConfig(
                 mode=selector.NumberSelectorMode.BOX,
@@ -50,32 +108,63 @@ OPTIONS_SCHEMA_NUMERIC_STATE = vol.Schema(
                 mode=selector.NumberSelectorMode.BOX,
             ),
         ),
+        vol.Optional(CONF_AGGREGATES): selector.SelectSelector(
+            selector.SelectSelectorConfig(
+                options=[aggregate.value for aggregate in AggregateTypes],
+                multiple=True,
+                translation_key="aggregates",
+            )
+        ),
+        vol.Optional(CONF_STATE_FOR): selector.DurationSelector(),
+        vol.Optional(CONF_MAX_UPDATE_DELAY): MAX_UPDATE_DELAY_SELECTOR,
+        vol.Optional(CONF_STARTUP_GRACE_PERIOD): STARTUP_GRACE_PERIOD_SELECTOR,
+        vol.Optional(CONF_MAX_ENTITIES): MAX_ENTITIES_SELECTOR,
     }
 )
 
 OPTIONS_SCHEMA_STATE = vol.Schema(
     {
         vol.Required(CONF_LABEL): selector.LabelSelector(),
-        vol.Required(CONF_STATE_TO): selector.SelectSelector(
+        vol.Optional(CONF_LABELS_ALL): LABELS_SELECTOR,
+        vol.Optional(CONF_LABELS_NOT): LABELS_SELECTOR,
+        vol.Optional(CONF_INHERIT_LABELS): selector.BooleanSelector(),
+        vol.Optional(CONF_ATTRIBUTE): ATTRIBUTE_SELECTOR,
+        vol.Optional(CONF_STATE_TO): selector.SelectSelector(
             selector.SelectSelectorConfig(
                 options=STATE_TO_OPTIONS,
                 translation_key="state_to",
                 custom_value=True,
+                multiple=True,
             )
         ),
+        vol.Optional(CONF_STATE_PATTERN): STATE_PATTERN_SELECTOR,
+        vol.Optional(CONF_STATE_FOR): selector.DurationSelector(),
+        vol.Optional(CONF_MAX_UPDATE_DELAY): MAX_UPDATE_DELAY_SELECTOR,
+        vol.Optional(CONF_STARTUP_GRACE_PERIOD): STARTUP_GRACE_PERIOD_SELECTOR,
+        vol.Optional(CONF_MAX_ENTITIES): MAX_ENTITIES_SELECTOR,
     }
 )
 
 OPTIONS_SCHEMA_NOT_STATE = vol.Schema(
     {
         vol.Required(CONF_LABEL): selector.LabelSelector(),
-        vol.Required(CONF_STATE_NOT): selector.SelectSelector(
+        vol.Optional(CONF_LABELS_ALL): LABELS_SELECTOR,
+        vol.Optional(CONF_LABELS_NOT): LABELS_SELECTOR,
+        vol.Optional(CONF_INHERIT_LABELS): selector.BooleanSelector(),
+        vol.Optional(CONF_ATTRIBUTE): ATTRIBUTE_SELECTOR,
+        vol.Optional(CONF_STATE_NOT): selector.SelectSelector(
             selector.SelectSelectorConfig(
                 options=STATE_NOT_OPTIONS,
                 translation_key="state_not",
                 custom_value=True,
+                multiple=True,
             )
         ),
+        vol.Optional(CONF_STATE_PATTERN): STATE_PATTERN_SELECTOR,
+        vol.Optional(CONF_STATE_FOR): selector.DurationSelector(),
+        vol.Optional(CONF_MAX_UPDATE_DELAY): MAX_UPDATE_DELAY_SELECTOR,
+        vol.Optional(CONF_STARTUP_GRACE_PERIOD): STARTUP_GRACE_PERIOD_SELECTOR,
+        vol.Optional(CONF_MAX_ENTITIES): MAX_ENTITIES_SELECTOR,
     }
 )
 
@@ -124,6 +213,21 @@ def _validate_upper_or_lower(options: dict[str, Any]) -> None:
         raise SchemaFlowError("upper_or_lower_not_specified")
 
 
+def _validate_states_or_pattern(state_key: str, options: dict[str, Any]) -> None:
+    """Validate states or a state pattern are set and compile."""
+    states = options.get(state_key)
+    pattern = options.get(CONF_STATE_PATTERN)
+
+    if not states and not pattern:
+        raise SchemaFlowError("states_or_pattern_not_specified")
+
+    # Built the same way as the sensor, so what is accepted also compiles
+    try:
+        StateMatcher(states, pattern)
+    except re.error as err:
+        raise SchemaFlowError("invalid_pattern") from err
+
+
 def validate_user_input(
     state_type: str,
 ) -> Callable[
@@ -133,7 +237,7 @@ def validate_user_input(
     """Do post validation of user input.
 
     For numeric state: Validate an upper or lower limit is set.
-    For state: Validate a from or to is set.
+    For state and not state: Validate states or a state pattern are set.
     For all domaines: Set state type.
     """
 
@@ -144,6 +248,10 @@ def validate_user_input(
         """Validate based on label type and add label type to user input."""
         if state_type == StateTypes.NUMERIC_STATE:
             _validate_upper_or_lower(user_input)
+        elif state_type == StateTypes.STATE:
+            _validate_states_or_pattern(CONF_STATE_TO, user_input)
+        else:
+            _validate_states_or_pattern(CONF_STATE_NOT, user_input)
         return {CONF_STATE_TYPE: state_type} | user_input
 
     return _validate_user_input
@@ -185,6 +293,9 @@ OPTIONS_FLOW = {
 class ConfigFlowHandler(SchemaConfigFlowHandler, domain=DOMAIN):
     """Handle a config or options flow for Label State."""
 
+    VERSION = CONFIG_VERSION
+    MINOR_VERSION = CONFIG_MINOR_VERSION
+
     config_flow = CONFIG_FLOW
     options_flow = OPTIONS_FLOW
 
@@ -11,19 +11,42 @@ MIN_HA_VERSION = "2025.11"
 
 DOMAIN = "label_state"
 CONFIG_VERSION = 1
+CONFIG_MINOR_VERSION = 2
 
-PLATFORMS = [Platform.BINARY_SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
 CONF_LABEL = "label"
+CONF_LABELS_ALL = "labels_all"
+CONF_LABELS_NOT = "labels_not"
+CONF_INHERIT_LABELS = "inherit_labels"
 CONF_STATE_TYPE = "state_type"
 CONF_STATE_TO = "state_to"
 CONF_STATE_NOT = "state_not"
+CONF_STATE_PATTERN = "state_pattern"
 CONF_STATE_LOWER_LIMIT = "state_lower_limit"
 CONF_STATE_UPPER_LIMIT = "state_upper_limit"
+CONF_STATE_FOR = "state_for"
+CONF_MAX_UPDATE_DELAY = "max_update_delay"
+CONF_STARTUP_GRACE_PERIOD = "startup_grace_period"
+CONF_AGGREGATES = "aggregates"
+CONF_MAX_ENTITIES = "max_entities"
 
 ATTR_ENTITIES = "entities"
 ATTR_ENTITY_NAMES = "entity_names"
+ATTR_ENTITY_COUNT = "entity_count"
 ATTR_LABEL_NAME = "label_name"
+ATTR_MATCHES = "matches"
+ATTR_SINCE = "since"
+ATTR_VALUE = "value"
+ATTR_OFFSET = "offset"
+ATTR_LIMIT = "limit"
+ATTR_LABEL_STATE_ENTITY_ID = "label_state_entity_id"
+ATTR_MATCHED = "matched"
+
+EVENT_ENTITY_CHANGED = f"{DOMAIN}_entity_changed"
+
+
+SERVICE_GET_MATCHES = "get_matches"
 
 
 class StateTypes(StrEnum):
@@ -32,3 +55,13 @@ class StateTypes(StrEnum):
     NUMERIC_STATE = "numeric_state"
     STATE = "state"
     NOT_STATE = "state_not"
+
+
+class AggregateTypes(StrEnum):
+    """Available aggregates of numeric states."""
+
+    MIN = "min"
+    MAX = "max"
+    MEAN = "mean"
+    MEDIAN = "median"
+    COUNT = "count"
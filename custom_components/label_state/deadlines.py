@@ -0,0 +1,107 @@
+"""Deadlines for the duration condition of label_state sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime
+from heapq import heapify, heappop, heappush
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
+
+type DeadlinesExpiredCallback = Callable[[list[str]], None]
+
+# Rebuild the heap once stale entries outnumber the live deadlines by this much
+HEAP_COMPACT_THRESHOLD = 64
+
+
+class DeadlineQueue:
+    """Expire deadlines of entities with a single timer.
+
+    Deadlines are kept in a heap, only the earliest one is scheduled. A
+    removed or replaced deadline is left in the heap and skipped when it
+    reaches the top, so removing is a dictionary delete.
+    """
+
+    __slots__ = ("_deadlines", "_heap", "_on_expired", "_scheduled", "_unsub", "hass")
+
+    def __init__(
+        self, hass: HomeAssistant, on_expired: DeadlinesExpiredCallback
+    ) -> None:
+        """Initialize the deadline queue."""
+        self.hass = hass
+        self._on_expired = on_expired
+        self._deadlines: dict[str, datetime] = {}
+        self._heap: list[tuple[datetime, str]] = []
+        self._scheduled: datetime | None = None
+        self._unsub: CALLBACK_TYPE | None = None
+
+    def __contains__(self, entity_id: object) -> bool:
+        """Return if the entity has a pending deadline."""
+        return entity_id in self._deadlines
+
+    def __len__(self) -> int:
+        """Return the number of pending deadlines."""
+        return len(self._deadlines)
+
+    @callback
+    def async_add(self, entity_id: str, deadline: datetime) -> None:
+        """Set the deadline of an entity."""
+        self._deadlines[entity_id] = deadline
+        heappush(self._heap, (deadline, entity_id))
+        if self._scheduled is None or deadline < self._scheduled:
+            self._async_schedule(deadline)
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Drop the deadline of an entity."""
+        if self._deadlines.pop(entity_id, None) is None:
+            return
+
+        if len(self._heap) > 2 * len(self._deadlines) + HEAP_COMPACT_THRESHOLD:
+            self._heap = [(deadline, key) for key, deadline in self._deadlines.items()]
+            heapify(self._heap)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the timer and drop all deadlines."""
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        self._scheduled = None
+        self._deadlines.clear()
+        self._heap.clear()
+
+    @callback
+    def _async_schedule(self, deadline: datetime) -> None:
+        """Schedule the timer for the earliest deadline."""
+        if self._unsub is not None:
+            self._unsub()
+        self._scheduled = deadline
+        self._unsub = async_track_point_in_utc_time(
+            self.hass, self._async_timer_fired, deadline
+        )
+
+    @callback
+    def _async_timer_fired(self, now: datetime) -> None:
+        """Expire every deadline that has passed and schedule the next."""
+        self._unsub = None
+        self._scheduled = None
+
+        heap = self._heap
+        deadlines = self._deadlines
+        expired: list[str] = []
+        while heap:
+            deadline, entity_id = heap[0]
+            if deadlines.get(entity_id) != deadline:
+                heappop(heap)
+            elif deadline <= now:
+                heappop(heap)
+                del deadlines[entity_id]
+                expired.append(entity_id)
+            else:
+                self._async_schedule(deadline)
+                break
+
+        if expired:
+            self._on_expired(expired)
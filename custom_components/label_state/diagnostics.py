@@ -0,0 +1,29 @@
+"""Diagnostics support for label_state."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import LabelStateConfigEntry
+from .const import CONF_LABEL
+from .hub import async_get_hub
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: LabelStateConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    hub = async_get_hub(hass)
+    label_id: str = entry.options[CONF_LABEL]
+
+    return {
+        "options": dict(entry.options),
+        "stats": entry.runtime_data.stats.as_dict(),
+        "hub": {
+            "label_listeners": hub.async_listener_count(label_id),
+            "label_subscriptions": len(hub.async_tracked_entity_ids(label_id)),
+            "total_subscriptions": hub.async_subscription_count(),
+        },
+    }
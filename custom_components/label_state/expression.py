@@ -0,0 +1,75 @@
+"""Label expressions for label_state sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+
+from .inheritance import async_entity_ids_for_label, async_entity_labels
+
+
+class LabelExpression:
+    """Select entities by a label, the labels they also need and must not have.
+
+    The entities of the primary label are the candidates the hub subscribes,
+    the other labels only narrow them down. Membership is computed once
+    with set operations on the registries' label indexes, after which single
+    entities are re-checked as their labels, or those of their device or
+    area, change.
+    """
+
+    __slots__ = ("inherit", "label_id", "labels_all", "labels_not")
+
+    def __init__(
+        self,
+        label_id: str,
+        labels_all: Iterable[str] = (),
+        labels_not: Iterable[str] = (),
+        *,
+        inherit: bool = False,
+    ) -> None:
+        """Initialize the label expression."""
+        self.label_id = label_id
+        self.labels_all = frozenset(labels_all) - {label_id}
+        self.labels_not = frozenset(labels_not)
+        # Whether entities also carry the labels of their device and area
+        self.inherit = inherit
+
+    @callback
+    def async_entity_labels(
+        self, hass: HomeAssistant, entity_entry: er.RegistryEntry
+    ) -> set[str]:
+        """Return the labels the expression is matched against for an entity."""
+        if self.inherit:
+            return async_entity_labels(hass, entity_entry)
+        return entity_entry.labels
+
+    def matches(self, labels: set[str]) -> bool:
+        """Return if an entity with the labels is selected."""
+        return (
+            self.label_id in labels
+            and self.labels_all <= labels
+            and self.labels_not.isdisjoint(labels)
+        )
+
+    @callback
+    def async_members(self, hass: HomeAssistant, candidates: Iterable[str]) -> set[str]:
+        """Return the candidate entity_ids that are selected.
+
+        The candidates can include entities subscribed for another sensor
+        of the label that inherits it, when this one does not.
+        """
+        members = set(candidates).intersection(
+            async_entity_ids_for_label(hass, self.label_id, inherit=self.inherit)
+        )
+        for label_id in self.labels_all:
+            members.intersection_update(
+                async_entity_ids_for_label(hass, label_id, inherit=self.inherit)
+            )
+        for label_id in self.labels_not:
+            members.difference_update(
+                async_entity_ids_for_label(hass, label_id, inherit=self.inherit)
+            )
+        return members
@@ -0,0 +1,96 @@
+"""Stream the changes to the match set of a label_state sensor."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE, callback
+
+type MatchDeltaCallback = Callable[[dict[str, str], list[str]], None]
+
+
+class MatchFeed:
+    """Pass on the entities entering and leaving the match set of a sensor.
+
+    Changes are only collected while there are listeners, and are passed on
+    when the sensor writes its state so they follow the update delay. An
+    entity that enters and leaves again in between is not passed on at all.
+    The feed ends with its config entry, as a reload creates a new one.
+    """
+
+    __slots__ = ("_added", "_listeners", "_removed", "entities")
+
+    def __init__(self) -> None:
+        """Initialize the feed."""
+        # The live match set of the sensor, mapped to the display names
+        self.entities: dict[str, str] = {}
+        self._listeners: list[tuple[MatchDeltaCallback, CALLBACK_TYPE]] = []
+        self._added: dict[str, None] = {}
+        self._removed: dict[str, None] = {}
+
+    @callback
+    def async_add_listener(
+        self, delta_callback: MatchDeltaCallback, end_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Listen for the entities entering and leaving the match set.
+
+        The end callback is called when the feed ends.
+        """
+        listener = (delta_callback, end_callback)
+        self._listeners.append(listener)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener."""
+            if listener not in self._listeners:
+                return
+            self._listeners.remove(listener)
+            if not self._listeners:
+                self._added.clear()
+                self._removed.clear()
+
+        return remove_listener
+
+    @callback
+    def async_shutdown(self) -> None:
+        """End the feed, telling the listeners."""
+        listeners = self._listeners
+        self._listeners = []
+        self._added.clear()
+        self._removed.clear()
+        for _, end_callback in listeners:
+            end_callback()
+
+    @callback
+    def async_matched(self, entity_id: str) -> None:
+        """Record an entity entering the match set."""
+        if not self._listeners:
+            return
+        if entity_id in self._removed:
+            del self._removed[entity_id]
+        else:
+            self._added[entity_id] = None
+
+    @callback
+    def async_unmatched(self, entity_id: str) -> None:
+        """Record an entity leaving the match set."""
+        if not self._listeners:
+            return
+        if entity_id in self._added:
+            del self._added[entity_id]
+        else:
+            self._removed[entity_id] = None
+
+    @callback
+    def async_flush(self) -> None:
+        """Pass the changes since the last flush on to the listeners."""
+        if not self._added and not self._removed:
+            return
+
+        entities = self.entities
+        added = {entity_id: entities[entity_id] for entity_id in self._added}
+        removed = list(self._removed)
+        self._added.clear()
+        self._removed.clear()
+        for delta_callback, _ in tuple(self._listeners):
+            delta_callback(added, removed)
@@ -0,0 +1,443 @@
+"""Shared label subscriptions for label_state sensors."""
+
+from __future__ import annotations
+
+from typing import Protocol
+
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    label_registry as lr,
+)
+from homeassistant.helpers.area_registry import EVENT_AREA_REGISTRY_UPDATED
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
+from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
+from homeassistant.helpers.label_registry import EVENT_LABEL_REGISTRY_UPDATED
+from homeassistant.util.hass_dict import HassKey
+
+from .const import DOMAIN, LOGGER
+from .inheritance import (
+    async_area_entity_ids,
+    async_entity_ids_for_label,
+    async_entity_labels,
+)
+from .names import NameCache
+from .state_table import extract_state
+from .subscriptions import SubscriptionManager
+
+DATA_HUB: HassKey[LabelStateHub] = HassKey(DOMAIN)
+
+# Entity registry changes that can change the labels an entity inherits
+ENTITY_INHERITANCE_CHANGES = frozenset({"area_id", "device_id"})
+# Device registry changes that can change the labels its entities inherit
+DEVICE_INHERITANCE_CHANGES = frozenset({"area_id", "labels"})
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> LabelStateHub:
+    """Get the label state hub, creating it on first use."""
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = LabelStateHub(hass)
+    return hub
+
+
+class LabelStateListener(Protocol):
+    """A consumer of the updates for a label."""
+
+    @callback
+    def async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Handle a state change of an entity with the label."""
+
+    @callback
+    def async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Handle an entity gaining, losing or being renamed with the label.
+
+        Also called when the other labels of an entity with the label change.
+        """
+
+    @callback
+    def async_label_registry_updated(
+        self, event: Event[lr.EventLabelRegistryUpdatedData]
+    ) -> None:
+        """Handle an update of the label itself."""
+
+    @callback
+    def async_names_updated(self, entity_ids: set[str]) -> None:
+        """Handle the display names of entities with the label changing."""
+
+    @callback
+    def async_memberships_updated(self, entity_ids: set[str]) -> None:
+        """Handle the labels inherited by entities changing."""
+
+
+class LabelStateHub:
+    """Own the state and registry subscriptions for labelled entities.
+
+    Each (entity, label) pair is subscribed once, however many sensors are
+    configured for the label, and state changes are fanned out to every
+    listener of the label. Registry events are listened to once for the
+    domain and only dispatched to the listeners of the affected labels.
+
+    Listeners can include the entities whose device or area has the label,
+    these are resolved through the registries' device, area and label
+    indexes and re-resolved for just the entities of a device or area whose
+    labels change.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the hub."""
+        self.hass = hass
+        self._listeners: dict[str, list[LabelStateListener]] = {}
+        self._subscriptions = SubscriptionManager(hass, self._async_state_listener)
+        self.names = NameCache(hass, self._async_names_invalidated)
+        self._registry_unsubs: list[CALLBACK_TYPE] = []
+        # Number of listeners of each label that include inherited labels
+        self._inheriting: dict[str, int] = {}
+        # Labels of the areas, as area registry updates do not list changes
+        self._area_labels: dict[str, set[str]] = {}
+
+    @callback
+    def async_add_listener(
+        self, label_id: str, listener: LabelStateListener, *, inherit: bool = False
+    ) -> CALLBACK_TYPE:
+        """Listen for updates of entities with the label.
+
+        With inherit, entities whose device or area has the label are included.
+        """
+        if not self._listeners:
+            self._async_listen_registries()
+
+        listeners = self._listeners.setdefault(label_id, [])
+        listeners.append(listener)
+
+        if len(listeners) == 1:
+            # Subscribe every entity of the label, found by the label index
+            ent_reg = er.async_get(self.hass)
+            self._subscriptions.async_add_many(
+                (
+                    entity_entry.entity_id
+                    for entity_entry in er.async_entries_for_label(ent_reg, label_id)
+                ),
+                label_id,
+            )
+
+        if inherit:
+            self._async_add_inheriting(label_id)
+
+        @callback
+        def remove_listener() -> None:
+            """Remove the listener, unsubscribing the label if it was the last."""
+            listeners.remove(listener)
+            if inherit:
+                self._async_remove_inheriting(label_id)
+            if not listeners:
+                del self._listeners[label_id]
+                self._subscriptions.async_remove_label(label_id)
+            if not self._listeners:
+                self._async_unlisten_registries()
+
+        return remove_listener
+
+    @callback
+    def _async_add_inheriting(self, label_id: str) -> None:
+        """Include the entities inheriting the label."""
+        if not self._inheriting:
+            self._area_labels = {
+                area_entry.id: set(area_entry.labels)
+                for area_entry in ar.async_get(self.hass).async_list_areas()
+            }
+
+        self._inheriting[label_id] = self._inheriting.get(label_id, 0) + 1
+        if self._inheriting[label_id] == 1:
+            self._subscriptions.async_add_many(
+                async_entity_ids_for_label(self.hass, label_id, inherit=True),
+                label_id,
+            )
+
+    @callback
+    def _async_remove_inheriting(self, label_id: str) -> None:
+        """Stop including the entities inheriting the label once unused."""
+        self._inheriting[label_id] -= 1
+        if self._inheriting[label_id]:
+            return
+
+        del self._inheriting[label_id]
+        if not self._inheriting:
+            self._area_labels.clear()
+
+        ent_reg = er.async_get(self.hass)
+        for entity_id in self._subscriptions.async_entity_ids(label_id):
+            entity_entry = ent_reg.async_get(entity_id)
+            if entity_entry is None or label_id not in entity_entry.labels:
+                self._subscriptions.async_remove(entity_id, label_id)
+
+    @callback
+    def _async_tracked_labels(self, entity_entry: er.RegistryEntry) -> set[str]:
+        """Return the labels with listeners an entity should be subscribed for."""
+        labels = entity_entry.labels & self._listeners.keys()
+        if self._inheriting:
+            labels |= (
+                async_entity_labels(self.hass, entity_entry) & self._inheriting.keys()
+            )
+        return labels
+
+    @callback
+    def async_track_entity(self, label_id: str, entity_id: str) -> None:
+        """Subscribe to state changes of an entity for the label."""
+        if label_id in self._listeners:
+            self._subscriptions.async_add(entity_id, label_id)
+
+    @callback
+    def async_listener_count(self, label_id: str) -> int:
+        """Return the number of listeners for the label."""
+        return len(self._listeners.get(label_id, ()))
+
+    @callback
+    def async_tracked_entity_ids(self, label_id: str) -> list[str]:
+        """Return the entity_ids subscribed for the label."""
+        return sorted(self._subscriptions.async_entity_ids(label_id))
+
+    @callback
+    def async_seed_states(
+        self, label_id: str, attribute: str | None = None
+    ) -> dict[str, str]:
+        """Return the current state of each entity subscribed for the label.
+
+        With an attribute its value is returned instead of the state. Entities
+        without a state yet are reported as unknown.
+        """
+        get_state = self.hass.states.get
+        return {
+            entity_id: extract_state(get_state(entity_id), attribute)
+            for entity_id in self._subscriptions.async_iter_entity_ids(label_id)
+        }
+
+    @callback
+    def async_subscription_count(self) -> int:
+        """Return the number of state subscriptions across all labels."""
+        return len(self._subscriptions)
+
+    @callback
+    def _async_listen_registries(self) -> None:
+        """Listen for the registry events, once for all labels."""
+        self._registry_unsubs = [
+            self.hass.bus.async_listen(
+                EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_entity_registry_updated,
+                event_filter=self._async_entity_registry_filter,
+            ),
+            self.hass.bus.async_listen(
+                EVENT_LABEL_REGISTRY_UPDATED,
+                self._async_label_registry_updated,
+                event_filter=self._async_label_registry_filter,
+            ),
+            self.hass.bus.async_listen(
+                EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_device_registry_updated,
+                event_filter=self._async_device_registry_filter,
+            ),
+            self.hass.bus.async_listen(
+                EVENT_AREA_REGISTRY_UPDATED,
+                self._async_area_registry_updated,
+                event_filter=self._async_area_registry_filter,
+            ),
+            self.names.async_listen(),
+        ]
+
+    @callback
+    def _async_unlisten_registries(self) -> None:
+        """Stop listening for the registry events."""
+        for unsub in self._registry_unsubs:
+            unsub()
+        self._registry_unsubs = []
+
+    @callback
+    def _async_state_listener(
+        self, label_id: str, event: Event[EventStateChangedData]
+    ) -> None:
+        """Fan a state change out to the listeners of the label."""
+        for listener in tuple(self._listeners.get(label_id, ())):
+            listener.async_state_changed(event)
+
+    @callback
+    def _async_names_invalidated(self, entity_ids: set[str]) -> None:
+        """Dispatch name changes to the listeners of the entities' labels."""
+        labels: set[str] = set()
+        for entity_id in entity_ids:
+            labels |= self._subscriptions.async_labels(entity_id)
+
+        for label_id in labels:
+            for listener in tuple(self._listeners.get(label_id, ())):
+                listener.async_names_updated(entity_ids)
+
+    @callback
+    def _async_entity_registry_filter(
+        self, event_data: er.EventEntityRegistryUpdatedData
+    ) -> bool:
+        """Filter entity registry events to ones that can affect membership."""
+        entity_id = event_data["entity_id"]
+
+        if event_data["action"] == "remove":
+            return entity_id in self._subscriptions
+
+        if event_data["action"] == "update":
+            if event_data.get("old_entity_id") in self._subscriptions:
+                return True
+            changes = event_data["changes"]
+            if "labels" not in changes and (
+                not self._inheriting or ENTITY_INHERITANCE_CHANGES.isdisjoint(changes)
+            ):
+                return False
+            if entity_id in self._subscriptions:
+                return True
+
+        entity_entry = er.async_get(self.hass).async_get(entity_id)
+        return entity_entry is not None and bool(
+            self._async_tracked_labels(entity_entry)
+        )
+
+    @callback
+    def _async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Update the subscriptions and dispatch to the affected labels."""
+        data = event.data
+        entity_id = data["entity_id"]
+        affected: set[str] = set()
+
+        if data["action"] == "remove":
+            affected = self._subscriptions.async_remove_entity(entity_id)
+        else:
+            if data["action"] == "update" and "old_entity_id" in data:
+                # The entity_id was changed, move the subscriptions across
+                affected = self._subscriptions.async_resubscribe(
+                    data["old_entity_id"], entity_id
+                )
+
+            entity_entry = er.async_get(self.hass).async_get(entity_id)
+            labels = self._async_tracked_labels(entity_entry) if entity_entry else set()
+            tracked = self._subscriptions.async_labels(entity_id)
+
+            for label_id in tracked - labels:
+                self._subscriptions.async_remove(entity_id, label_id)
+                affected.add(label_id)
+
+            for label_id in labels - tracked:
+                LOGGER.debug("Found label %s in entity %s", label_id, entity_id)
+                self._subscriptions.async_add(entity_id, label_id)
+                affected.add(label_id)
+
+            # The entity's other labels, or those it inherits, changed which
+            # decide whether it is selected by the label expressions
+            if data["action"] == "update":
+                affected |= tracked & labels
+
+        for label_id in affected:
+            for listener in tuple(self._listeners.get(label_id, ())):
+                listener.async_entity_registry_updated(event)
+
+    @callback
+    def _async_label_registry_filter(
+        self, event_data: lr.EventLabelRegistryUpdatedData
+    ) -> bool:
+        """Filter label registry events to updates of labels with listeners."""
+        return event_data["action"] == "update" and (
+            event_data["label_id"] in self._listeners
+        )
+
+    @callback
+    def _async_label_registry_updated(
+        self, event: Event[lr.EventLabelRegistryUpdatedData]
+    ) -> None:
+        """Dispatch a label update to the listeners of the label."""
+        for listener in tuple(self._listeners.get(event.data["label_id"], ())):
+            listener.async_label_registry_updated(event)
+
+    @callback
+    def _async_update_memberships(self, entity_ids: list[str]) -> None:
+        """Re-resolve the labels of entities and dispatch to the affected labels."""
+        ent_reg = er.async_get(self.hass)
+        affected: dict[str, set[str]] = {}
+
+        for entity_id in entity_ids:
+            entity_entry = ent_reg.async_get(entity_id)
+            labels = self._async_tracked_labels(entity_entry) if entity_entry else set()
+            tracked = self._subscriptions.async_labels(entity_id)
+
+            for label_id in tracked - labels:
+                self._subscriptions.async_remove(entity_id, label_id)
+            for label_id in labels - tracked:
+                self._subscriptions.async_add(entity_id, label_id)
+            for label_id in labels | tracked:
+                affected.setdefault(label_id, set()).add(entity_id)
+
+        for label_id, label_entity_ids in affected.items():
+            for listener in tuple(self._listeners.get(label_id, ())):
+                listener.async_memberships_updated(label_entity_ids)
+
+    @callback
+    def _async_device_registry_filter(
+        self, event_data: dr.EventDeviceRegistryUpdatedData
+    ) -> bool:
+        """Filter device registry events to label and area changes."""
+        return (
+            bool(self._inheriting)
+            and event_data["action"] == "update"
+            and not DEVICE_INHERITANCE_CHANGES.isdisjoint(event_data["changes"])
+        )
+
+    @callback
+    def _async_device_registry_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Re-resolve the entities of a device whose labels or area changed."""
+        self._async_update_memberships(
+            [
+                entity_entry.entity_id
+                for entity_entry in er.async_entries_for_device(
+                    er.async_get(self.hass),
+                    event.data["device_id"],
+                    include_disabled_entities=True,
+                )
+            ]
+        )
+
+    @callback
+    def _async_area_registry_filter(
+        self, event_data: ar.EventAreaRegistryUpdatedData
+    ) -> bool:
+        """Filter area registry events to label changes."""
+        if not self._inheriting:
+            return False
+
+        area_id = event_data["area_id"]
+        if event_data["action"] == "remove":
+            return area_id in self._area_labels
+
+        area_entry = ar.async_get(self.hass).async_get_area(area_id)
+        labels = set(area_entry.labels) if area_entry else set()
+        return labels != self._area_labels.get(area_id, set())
+
+    @callback
+    def _async_area_registry_updated(
+        self, event: Event[ar.EventAreaRegistryUpdatedData]
+    ) -> None:
+        """Re-resolve the entities of an area whose labels changed."""
+        area_id = event.data["area_id"]
+        if (area_entry := ar.async_get(self.hass).async_get_area(area_id)) is None:
+            # The entities of a removed area are updated by their registries
+            self._area_labels.pop(area_id, None)
+            return
+
+        self._area_labels[area_id] = set(area_entry.labels)
+        self._async_update_memberships(async_area_entity_ids(self.hass, area_id))
@@ -0,0 +1,88 @@
+"""Labels inherited by entities from their device and area."""
+
+from __future__ import annotations
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+)
+
+
+@callback
+def async_entity_labels(
+    hass: HomeAssistant, entity_entry: er.RegistryEntry
+) -> set[str]:
+    """Return the labels of an entity, including those of its device and area.
+
+    The area of an entity is its own area, or the area of its device when it
+    does not have one.
+    """
+    labels = set(entity_entry.labels)
+    area_id = entity_entry.area_id
+
+    if entity_entry.device_id is not None and (
+        device_entry := dr.async_get(hass).async_get(entity_entry.device_id)
+    ):
+        labels |= device_entry.labels
+        area_id = area_id or device_entry.area_id
+
+    if area_id is not None and (
+        area_entry := ar.async_get(hass).async_get_area(area_id)
+    ):
+        labels |= area_entry.labels
+
+    return labels
+
+
+@callback
+def async_area_entity_ids(hass: HomeAssistant, area_id: str) -> list[str]:
+    """Return the entities in an area, directly or through their device."""
+    ent_reg = er.async_get(hass)
+    entity_ids = [
+        entity_entry.entity_id
+        for entity_entry in er.async_entries_for_area(ent_reg, area_id)
+    ]
+    for device_entry in dr.async_entries_for_area(dr.async_get(hass), area_id):
+        entity_ids.extend(
+            entity_entry.entity_id
+            for entity_entry in er.async_entries_for_device(
+                ent_reg, device_entry.id, include_disabled_entities=True
+            )
+            if entity_entry.area_id is None
+        )
+    return entity_ids
+
+
+@callback
+def async_entity_ids_for_label(
+    hass: HomeAssistant, label_id: str, *, inherit: bool
+) -> list[str]:
+    """Return the entities with a label, optionally through their device or area.
+
+    The registries index their entries by label, device and area, so this
+    only visits the entries that carry the label.
+    """
+    ent_reg = er.async_get(hass)
+    entity_ids = dict.fromkeys(
+        entity_entry.entity_id
+        for entity_entry in er.async_entries_for_label(ent_reg, label_id)
+    )
+    if not inherit:
+        return list(entity_ids)
+
+    for device_entry in dr.async_entries_for_label(dr.async_get(hass), label_id):
+        entity_ids.update(
+            dict.fromkeys(
+                entity_entry.entity_id
+                for entity_entry in er.async_entries_for_device(
+                    ent_reg, device_entry.id, include_disabled_entities=True
+                )
+            )
+        )
+
+    for area_entry in ar.async_entries_for_label(ar.async_get(hass), label_id):
+        entity_ids.update(dict.fromkeys(async_area_entity_ids(hass, area_entry.id)))
+
+    return list(entity_ids)
@@ -0,0 +1,142 @@
+"""Display names for labelled entities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+# Registry changes that alter a resolved name
+ENTITY_NAME_CHANGES = frozenset({"device_id", "entity_id", "name", "original_name"})
+DEVICE_NAME_CHANGES = frozenset({"name", "name_by_user"})
+
+type NamesInvalidatedCallback = Callable[[set[str]], None]
+
+
+class NameCache:
+    """Resolve and cache the device or entity name of entities.
+
+    Names are resolved once and reused by every sensor until a device or
+    entity registry update changes one of the cached entries.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, on_invalidated: NamesInvalidatedCallback
+    ) -> None:
+        """Initialize the name cache."""
+        self.hass = hass
+        self._on_invalidated = on_invalidated
+        self._names: dict[str, str] = {}
+        self._entity_devices: dict[str, str] = {}
+        self._device_entities: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        """Return the number of cached names."""
+        return len(self._names)
+
+    @callback
+    def async_get(self, entity_id: str) -> str:
+        """Get the device or entity name."""
+        if (name := self._names.get(entity_id)) is not None:
+            return name
+
+        entity_registry = er.async_get(self.hass)
+        entity_entry = entity_registry.async_get(entity_id)
+        if not entity_entry:
+            return entity_id
+
+        name = entity_entry.name or entity_entry.original_name or entity_id
+        if entity_entry.device_id:
+            device_registry = dr.async_get(self.hass)
+            device_entry = device_registry.async_get(device_id=entity_entry.device_id)
+            if device_entry is not None:
+                name = f"{device_entry.name_by_user or device_entry.name} ({name})"
+            self._entity_devices[entity_id] = entity_entry.device_id
+            self._device_entities.setdefault(entity_entry.device_id, set()).add(
+                entity_id
+            )
+
+        self._names[entity_id] = name
+        return name
+
+    @callback
+    def async_listen(self) -> CALLBACK_TYPE:
+        """Listen for registry updates that invalidate cached names."""
+        unsubs = [
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED,
+                self._async_entity_registry_updated,
+                event_filter=self._async_entity_registry_filter,
+            ),
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_device_registry_updated,
+                event_filter=self._async_device_registry_filter,
+            ),
+        ]
+
+        @callback
+        def unlisten() -> None:
+            """Stop listening and drop the cached names."""
+            for unsub in unsubs:
+                unsub()
+            self._names.clear()
+            self._entity_devices.clear()
+            self._device_entities.clear()
+
+        return unlisten
+
+    @callback
+    def _async_invalidate(self, entity_ids: set[str]) -> None:
+        """Drop the cached names of entities and notify."""
+        for entity_id in entity_ids:
+            del self._names[entity_id]
+            if (device_id := self._entity_devices.pop(entity_id, None)) is not None:
+                device_entities = self._device_entities[device_id]
+                device_entities.discard(entity_id)
+                if not device_entities:
+                    del self._device_entities[device_id]
+
+        self._on_invalidated(entity_ids)
+
+    @callback
+    def _async_entity_registry_filter(
+        self, event_data: er.EventEntityRegistryUpdatedData
+    ) -> bool:
+        """Filter entity registry events to cached entities."""
+        if event_data["action"] == "update":
+            return (
+                event_data["entity_id"] in self._names
+                or event_data.get("old_entity_id") in self._names
+            ) and not ENTITY_NAME_CHANGES.isdisjoint(event_data["changes"])
+        return event_data["entity_id"] in self._names
+
+    @callback
+    def _async_entity_registry_updated(
+        self, event: Event[er.EventEntityRegistryUpdatedData]
+    ) -> None:
+        """Invalidate the name of an updated or removed entity."""
+        data = event.data
+        entity_ids = {data["entity_id"]}
+        if data["action"] == "update" and "old_entity_id" in data:
+            entity_ids.add(data["old_entity_id"])
+        self._async_invalidate(entity_ids & self._names.keys())
+
+    @callback
+    def _async_device_registry_filter(
+        self, event_data: dr.EventDeviceRegistryUpdatedData
+    ) -> bool:
+        """Filter device registry events to devices of cached entities."""
+        if event_data["device_id"] not in self._device_entities:
+            return False
+        if event_data["action"] == "update":
+            return not DEVICE_NAME_CHANGES.isdisjoint(event_data["changes"])
+        return True
+
+    @callback
+    def _async_device_registry_updated(
+        self, event: Event[dr.EventDeviceRegistryUpdatedData]
+    ) -> None:
+        """Invalidate the names of the entities of an updated device."""
+        self._async_invalidate(set(self._device_entities[event.data["device_id"]]))
@@ -0,0 +1,191 @@
+"""Match predicates for label_state sensors."""
+
+from __future__ import annotations
+
+import fnmatch
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Mapping
+from math import inf
+from typing import Any, ClassVar, Self
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+
+from .const import (
+    CONF_STATE_LOWER_LIMIT,
+    CONF_STATE_NOT,
+    CONF_STATE_PATTERN,
+    CONF_STATE_TO,
+    CONF_STATE_UPPER_LIMIT,
+    LOGGER,
+    StateTypes,
+)
+from .state_table import EntityState
+
+PREDICATES: dict[str, type[LabelStatePredicate]] = {}
+
+# Characters that make a state value a glob pattern
+GLOB_CHARACTERS = frozenset("*?[")
+
+
+def register_predicate[PredicateT: type[LabelStatePredicate]](
+    state_type: str,
+) -> Callable[[PredicateT], PredicateT]:
+    """Register a predicate class for a state type."""
+
+    def decorator(predicate: PredicateT) -> PredicateT:
+        PREDICATES[state_type] = predicate
+        return predicate
+
+    return decorator
+
+
+def compile_predicate(
+    state_type: str, options: Mapping[str, Any]
+) -> LabelStatePredicate:
+    """Build the predicate for a state type from its options."""
+    return PREDICATES[state_type].from_options(options)
+
+
+class LabelStatePredicate(ABC):
+    """Decide if the state of a labelled entity matches.
+
+    Predicates are built once from the sensor options, so calling one only
+    compares the already folded or parsed state held in the state table.
+    """
+
+    __slots__ = ()
+
+    # Whether the state table needs to parse states as floats
+    numeric: ClassVar[bool] = False
+
+    @classmethod
+    @abstractmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Build the predicate from the sensor options."""
+
+    @abstractmethod
+    def __call__(self, row: EntityState) -> bool | None:
+        """Return if the state matches, None if it cannot be evaluated."""
+
+
+class StateMatcher:
+    """Match folded states against values, glob patterns and a regex.
+
+    Plain values are folded into a frozenset for a single lookup, while glob
+    patterns are compiled once into one case insensitive regex. The regex is
+    compiled on its own, so inline flags at its start keep working.
+    """
+
+    __slots__ = ("_globs", "_pattern", "_values")
+
+    def __init__(self, values: str | Iterable[str] | None, pattern: str | None) -> None:
+        """Initialize the matcher, raising re.error for an invalid pattern."""
+        if isinstance(values, str):
+            values = [values]
+        folded = {value.casefold() for value in values or () if value}
+        globs = {value for value in folded if GLOB_CHARACTERS.intersection(value)}
+        self._values = frozenset(folded - globs)
+
+        self._globs = (
+            re.compile(
+                "|".join(fnmatch.translate(glob) for glob in sorted(globs)),
+                re.IGNORECASE,
+            )
+            if globs
+            else None
+        )
+        self._pattern = re.compile(pattern, re.IGNORECASE) if pattern else None
+
+    def __bool__(self) -> bool:
+        """Return if there is anything to match."""
+        return (
+            bool(self._values) or self._globs is not None or self._pattern is not None
+        )
+
+    def __call__(self, state: str) -> bool:
+        """Return if the folded state matches."""
+        return (
+            state in self._values
+            or (self._globs is not None and self._globs.fullmatch(state) is not None)
+            or (
+                self._pattern is not None and self._pattern.fullmatch(state) is not None
+            )
+        )
+
+
+@register_predicate(StateTypes.STATE)
+class StatePredicate(LabelStatePredicate):
+    """Match entities that are in any of the states."""
+
+    __slots__ = ("_matcher",)
+
+    def __init__(
+        self, states: str | Iterable[str] | None, pattern: str | None = None
+    ) -> None:
+        """Initialize the predicate."""
+        self._matcher = StateMatcher(states, pattern)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Build the predicate from the sensor options."""
+        return cls(options.get(CONF_STATE_TO), options.get(CONF_STATE_PATTERN))
+
+    def __call__(self, row: EntityState) -> bool:
+        """Return if the state matches."""
+        return bool(row.state) and self._matcher(row.state)
+
+
+@register_predicate(StateTypes.NOT_STATE)
+class NotStatePredicate(LabelStatePredicate):
+    """Match entities that are in none of the states."""
+
+    __slots__ = ("_matcher",)
+
+    def __init__(
+        self, states: str | Iterable[str] | None, pattern: str | None = None
+    ) -> None:
+        """Initialize the predicate."""
+        self._matcher = StateMatcher(states, pattern)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Build the predicate from the sensor options."""
+        return cls(options.get(CONF_STATE_NOT), options.get(CONF_STATE_PATTERN))
+
+    def __call__(self, row: EntityState) -> bool:
+        """Return if the state does not match."""
+        return bool(self._matcher) and bool(row.state) and not self._matcher(row.state)
+
+
+@register_predicate(StateTypes.NUMERIC_STATE)
+class NumericStatePredicate(LabelStatePredicate):
+    """Match entities with a numeric state outside of the limits."""
+
+    __slots__ = ("_lower_limit", "_upper_limit")
+
+    numeric = True
+
+    def __init__(self, lower_limit: float | None, upper_limit: float | None) -> None:
+        """Initialize the predicate, treating a missing limit as unbounded."""
+        self._lower_limit = -inf if lower_limit is None else float(lower_limit)
+        self._upper_limit = inf if upper_limit is None else float(upper_limit)
+
+    @classmethod
+    def from_options(cls, options: Mapping[str, Any]) -> Self:
+        """Build the predicate from the sensor options."""
+        return cls(
+            options.get(CONF_STATE_LOWER_LIMIT), options.get(CONF_STATE_UPPER_LIMIT)
+        )
+
+    def __call__(self, row: EntityState) -> bool | None:
+        """Return if the value is outside of the limits."""
+        if (value := row.value) is None:
+            if not row.state or row.state in (STATE_UNKNOWN, STATE_UNAVAILABLE):
+                return False
+            LOGGER.error(
+                "Unable to determine state. Only numerical states are supported"
+            )
+            return None
+
+        return value < self._lower_limit or value > self._upper_limit
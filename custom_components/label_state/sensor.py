@@ -0,0 +1,246 @@
+"""Sensor platform for label_state."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
+from homeassistant.const import MATCH_ALL, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddConfigEntryEntitiesCallback
+
+from . import LabelStateConfigEntry
+from .aggregates import NumericAggregate
+from .const import CONF_AGGREGATES, AggregateTypes
+from .stats import LabelStateStats
+
+# The counters are cheap to keep, only publishing them is polled
+SCAN_INTERVAL = timedelta(seconds=30)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LabelStateDebugSensorEntityDescription(SensorEntityDescription):
+    """Describe a label_state debug sensor."""
+
+    value_fn: Callable[[LabelStateStats], float | None]
+    attributes_fn: Callable[[LabelStateStats], dict[str, Any]] | None = None
+
+
+def _mean_ms(seconds: float | None) -> float | None:
+    """Convert a mean latency to milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 4)
+
+
+DEBUG_SENSORS: tuple[LabelStateDebugSensorEntityDescription, ...] = (
+    LabelStateDebugSensorEntityDescription(
+        key="tracked_entities",
+        name="Tracked entities",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: stats.tracked_entities,
+    ),
+    LabelStateDebugSensorEntityDescription(
+        key="events_processed",
+        name="Events processed",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.events_processed,
+    ),
+    LabelStateDebugSensorEntityDescription(
+        key="recomputes",
+        name="Recomputes",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.recomputes,
+    ),
+    LabelStateDebugSensorEntityDescription(
+        key="writes_emitted",
+        name="State writes emitted",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.writes_emitted,
+    ),
+    LabelStateDebugSensorEntityDescription(
+        key="writes_suppressed",
+        name="State writes suppressed",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda stats: stats.writes_suppressed,
+    ),
+    LabelStateDebugSensorEntityDescription(
+        key="state_change_latency",
+        name="State change latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _mean_ms(stats.state_change_latency.mean),
+        attributes_fn=lambda stats: stats.state_change_latency.as_dict(),
+    ),
+    LabelStateDebugSensorEntityDescription(
+        key="update_latency",
+        name="Update latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda stats: _mean_ms(stats.update_latency.mean),
+        attributes_fn=lambda stats: stats.update_latency.as_dict(),
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class LabelStateAggregateSensorEntityDescription(SensorEntityDescription):
+    """Describe a label_state aggregate sensor."""
+
+    value_fn: Callable[[NumericAggregate], float | None]
+
+
+AGGREGATE_SENSORS: tuple[LabelStateAggregateSensorEntityDescription, ...] = (
+    LabelStateAggregateSensorEntityDescription(
+        key=AggregateTypes.MIN,
+        name="Min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.minimum,
+    ),
+    LabelStateAggregateSensorEntityDescription(
+        key=AggregateTypes.MAX,
+        name="Max",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.maximum,
+    ),
+    LabelStateAggregateSensorEntityDescription(
+        key=AggregateTypes.MEAN,
+        name="Mean",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.mean,
+    ),
+    LabelStateAggregateSensorEntityDescription(
+        key=AggregateTypes.MEDIAN,
+        name="Median",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.median,
+    ),
+    LabelStateAggregateSensorEntityDescription(
+        key=AggregateTypes.COUNT,
+        name="Count",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda aggregate: aggregate.count,
+    ),
+)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,  # pylint: disable=unused-argument
+    config_entry: LabelStateConfigEntry,
+    async_add_entities: AddConfigEntryEntitiesCallback,
+) -> None:
+    """Initialize the label state aggregate and debug sensors."""
+    entities: list[SensorEntity] = [LabelStateMatchCountSensor(config_entry)]
+
+    if (aggregate := config_entry.runtime_data.aggregate) is not None:
+        aggregates: list[str] = config_entry.options.get(CONF_AGGREGATES, [])
+        entities.extend(
+            LabelStateAggregateSensor(config_entry, aggregate, description)
+            for description in AGGREGATE_SENSORS
+            if description.key in aggregates
+        )
+
+    entities.extend(
+        LabelStateDebugSensor(config_entry, description)
+        for description in DEBUG_SENSORS
+    )
+    async_add_entities(entities)
+
+
+class LabelStateMatchCountSensor(SensorEntity):
+    """The number of entities with a label that match."""
+
+    _attr_icon = "mdi:tag"
+    _attr_should_poll = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, config_entry: LabelStateConfigEntry) -> None:
+        """Initialize the count sensor."""
+        self._match_count = config_entry.runtime_data.match_count
+        self._attr_name = f"{config_entry.title} Matching entities"
+        self._attr_unique_id = f"{config_entry.entry_id}_matching_entities"
+
+    async def async_added_to_hass(self) -> None:
+        """Handle added to Hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._match_count.async_add_listener(self._handle_count_update)
+        )
+        self._attr_native_value = self._match_count.count
+
+    @callback
+    def _handle_count_update(self) -> None:
+        """Write the new count."""
+        self._attr_native_value = self._match_count.count
+        self.async_write_ha_state()
+
+
+class LabelStateAggregateSensor(SensorEntity):
+    """An aggregate of the numeric states of the entities with a label."""
+
+    entity_description: LabelStateAggregateSensorEntityDescription
+
+    _attr_icon = "mdi:tag"
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        config_entry: LabelStateConfigEntry,
+        aggregate: NumericAggregate,
+        description: LabelStateAggregateSensorEntityDescription,
+    ) -> None:
+        """Initialize the aggregate sensor."""
+        self.entity_description = description
+        self._aggregate = aggregate
+        self._attr_name = f"{config_entry.title} {description.name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+        self._attr_native_value = description.value_fn(aggregate)
+
+    async def async_added_to_hass(self) -> None:
+        """Handle added to Hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self._aggregate.async_add_listener(self._handle_aggregate_update)
+        )
+        self._attr_native_value = self.entity_description.value_fn(self._aggregate)
+
+    @callback
+    def _handle_aggregate_update(self) -> None:
+        """Write the state if the aggregate changed."""
+        value = self.entity_description.value_fn(self._aggregate)
+        if value != self._attr_native_value:
+            self._attr_native_value = value
+            self.async_write_ha_state()
+
+
+class LabelStateDebugSensor(SensorEntity):
+    """A counter of the work done by a label_state sensor."""
+
+    entity_description: LabelStateDebugSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    def __init__(
+        self,
+        config_entry: LabelStateConfigEntry,
+        description: LabelStateDebugSensorEntityDescription,
+    ) -> None:
+        """Initialize the debug sensor."""
+        self.entity_description = description
+        self._stats = config_entry.runtime_data.stats
+        self._attr_name = f"{config_entry.title} {description.name}"
+        self._attr_unique_id = f"{config_entry.entry_id}_{description.key}"
+
+    async def async_update(self) -> None:
+        """Read the current counter value."""
+        description = self.entity_description
+        self._attr_native_value = description.value_fn(self._stats)
+        if description.attributes_fn is not None:
+            self._attr_extra_state_attributes = description.attributes_fn(self._stats)
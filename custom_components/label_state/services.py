@@ -0,0 +1,31 @@
+"""Services for label_state."""
+
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
+from homeassistant.core import HomeAssistant, SupportsResponse, callback
+from homeassistant.helpers import config_validation as cv, service
+from homeassistant.helpers.typing import VolDictType
+
+from .const import ATTR_LIMIT, ATTR_OFFSET, DOMAIN, SERVICE_GET_MATCHES
+
+GET_MATCHES_SCHEMA: VolDictType = {
+    vol.Optional(ATTR_OFFSET, default=0): cv.positive_int,
+    vol.Optional(ATTR_LIMIT): vol.All(vol.Coerce(int), vol.Range(min=1)),
+}
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the label_state services."""
+    service.async_register_platform_entity_service(
+        hass,
+        DOMAIN,
+        SERVICE_GET_MATCHES,
+        entity_domain=BINARY_SENSOR_DOMAIN,
+        schema=GET_MATCHES_SCHEMA,
+        func="async_get_matches",
+        supports_response=SupportsResponse.ONLY,
+    )
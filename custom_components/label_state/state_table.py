@@ -0,0 +1,97 @@
+"""Compact state table for label_state sensors."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.core import State, callback
+
+
+def extract_state(state: State | None, attribute: str | None) -> str:
+    """Return the state of an entity, or the value of one of its attributes.
+
+    An unavailable entity stays unavailable, as it has no attributes to match.
+    """
+    if state is None:
+        return STATE_UNKNOWN
+    if attribute is None or state.state == STATE_UNAVAILABLE:
+        return state.state
+    if (value := state.attributes.get(attribute)) is None:
+        return STATE_UNKNOWN
+    return str(value)
+
+
+class EntityState:
+    """The parts of a labelled entity's state needed for matching.
+
+    Built once per state change and only held while it is matched, the
+    state machine already keeps the state itself.
+    """
+
+    __slots__ = ("state", "value")
+
+    def __init__(self, state: str, value: float | None = None) -> None:
+        """Initialize the entity state."""
+        self.state = state
+        self.value = value
+
+
+class StateTable:
+    """The match results of the entities a sensor tracks.
+
+    Only entities that currently carry the label are kept, so memory is
+    bounded by the label's membership rather than by every entity the sensor
+    has ever seen. Each entity only costs its entry in a dict.
+    """
+
+    __slots__ = ("_matches", "_numeric", "invalid_count")
+
+    def __init__(self, *, numeric: bool) -> None:
+        """Initialize the state table."""
+        self._numeric = numeric
+        self._matches: dict[str, bool | None] = {}
+        self.invalid_count = 0
+
+    def __contains__(self, entity_id: object) -> bool:
+        """Return if the entity is in the table."""
+        return entity_id in self._matches
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the entity_ids in the table."""
+        return iter(self._matches)
+
+    def __len__(self) -> int:
+        """Return the number of entities in the table."""
+        return len(self._matches)
+
+    @callback
+    def async_parse(self, state: str) -> EntityState:
+        """Fold the state, and parse it as a float for numeric sensors."""
+        # Keep a reference to the original string when it is already folded,
+        # which it almost always is, rather than holding a copy
+        folded = state.casefold()
+        row = EntityState(state if folded == state else folded)
+
+        if self._numeric:
+            try:
+                row.value = float(state)
+            except ValueError:
+                row.value = None
+
+        return row
+
+    @callback
+    def async_set_match(self, entity_id: str, match: bool | None) -> None:
+        """Store the match result of an entity."""
+        if self._matches.get(entity_id, False) is None:
+            self.invalid_count -= 1
+        if match is None:
+            self.invalid_count += 1
+        self._matches[entity_id] = match
+
+    @callback
+    def async_remove(self, entity_id: str) -> None:
+        """Remove an entity from the table."""
+        if entity_id in self._matches and self._matches.pop(entity_id) is None:
+            self.invalid_count -= 1
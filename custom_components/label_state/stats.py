@@ -0,0 +1,95 @@
+"""Performance counters for label_state sensors."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any
+
+# Upper bounds of the latency histogram buckets, in seconds
+LATENCY_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05)
+
+
+class LatencyHistogram:
+    """A fixed bucket histogram of latencies."""
+
+    __slots__ = ("count", "counts", "max", "total")
+
+    def __init__(self) -> None:
+        """Initialize the histogram."""
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """Record a latency."""
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean latency in seconds."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the histogram as a dictionary."""
+        buckets = {
+            f"<={bound * 1000:g}ms": count
+            for bound, count in zip(LATENCY_BUCKETS, self.counts, strict=False)
+        }
+        buckets[f">{LATENCY_BUCKETS[-1] * 1000:g}ms"] = self.counts[-1]
+        mean = self.mean
+        return {
+            "count": self.count,
+            "mean_ms": None if mean is None else mean * 1000,
+            "max_ms": self.max * 1000,
+            "buckets": buckets,
+        }
+
+
+class LabelStateStats:
+    """Counters of the work done by a label_state sensor.
+
+    Only plain counters are updated while handling events so that they are
+    cheap enough to always be collected.
+    """
+
+    __slots__ = (
+        "events_ignored",
+        "events_processed",
+        "recomputes",
+        "registry_updates",
+        "state_change_latency",
+        "tracked_entities",
+        "update_latency",
+        "writes_emitted",
+        "writes_suppressed",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.tracked_entities = 0
+        self.events_processed = 0
+        self.events_ignored = 0
+        self.registry_updates = 0
+        self.recomputes = 0
+        self.writes_emitted = 0
+        self.writes_suppressed = 0
+        self.state_change_latency = LatencyHistogram()
+        self.update_latency = LatencyHistogram()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the counters as a dictionary."""
+        return {
+            "tracked_entities": self.tracked_entities,
+            "events_processed": self.events_processed,
+            "events_ignored": self.events_ignored,
+            "registry_updates": self.registry_updates,
+            "recomputes": self.recomputes,
+            "writes_emitted": self.writes_emitted,
+            "writes_suppressed": self.writes_suppressed,
+            "state_change_latency": self.state_change_latency.as_dict(),
+            "update_latency": self.update_latency.as_dict(),
+        }
@@ -0,0 +1,155 @@
+"""State change subscriptions for labelled entities."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+from .const import LOGGER
+
+type LabelStateAction = Callable[[str, Event[EventStateChangedData]], None]
+
+
+class SubscriptionManager:
+    """Track the state changes of each subscribed (entity, label) pair.
+
+    Subscriptions are keyed by entity_id so that relabelling, renaming or
+    removing an entity can be applied without scanning every label, and
+    adding an existing subscription is a no-op.
+
+    All pairs share a single state changed listener, filtered by the
+    subscribed entity_ids like the keyed trackers of Home Assistant, so
+    adding or removing a pair is a dict operation and the dispatched pairs
+    always match the current membership.
+    """
+
+    def __init__(self, hass: HomeAssistant, action: LabelStateAction) -> None:
+        """Initialize the subscription manager."""
+        self.hass = hass
+        self._action = action
+        self._unsub: CALLBACK_TYPE | None = None
+        # The labels of each entity, in the order they were subscribed
+        self._labels: dict[str, dict[str, None]] = {}
+        # The entity_ids of each label, in the order they were subscribed
+        self._members: dict[str, dict[str, None]] = {}
+
+    def __contains__(self, entity_id: object) -> bool:
+        """Return if the entity has any subscription."""
+        return entity_id in self._labels
+
+    def __len__(self) -> int:
+        """Return the number of subscriptions."""
+        return sum(len(labels) for labels in self._labels.values())
+
+    @callback
+    def async_labels(self, entity_id: str) -> set[str]:
+        """Return the labels the entity is subscribed for."""
+        return set(self._labels.get(entity_id, ()))
+
+    @callback
+    def async_entity_ids(self, label_id: str) -> set[str]:
+        """Return the entity_ids subscribed for the label."""
+        return set(self._members.get(label_id, ()))
+
+    @callback
+    def async_iter_entity_ids(self, label_id: str) -> Iterator[str]:
+        """Iterate the entity_ids subscribed for the label in subscription order."""
+        return iter(self._members.get(label_id, ()))
+
+    @callback
+    def async_add(self, entity_id: str, label_id: str) -> bool:
+        """Subscribe an entity for the label, return False if already subscribed."""
+        if label_id in self._labels.get(entity_id, ()):
+            return False
+
+        LOGGER.debug("Tracking %s for label %s", entity_id, label_id)
+        self._async_track(entity_id, label_id)
+        return True
+
+    @callback
+    def async_add_many(self, entity_ids: Iterable[str], label_id: str) -> list[str]:
+        """Subscribe entities for the label, return those added."""
+        added = [
+            entity_id
+            for entity_id in dict.fromkeys(entity_ids)
+            if label_id not in self._labels.get(entity_id, ())
+        ]
+        if added:
+            LOGGER.debug("Tracking %s entities for label %s", len(added), label_id)
+            for entity_id in added:
+                self._async_track(entity_id, label_id)
+        return added
+
+    @callback
+    def _async_track(self, entity_id: str, label_id: str) -> None:
+        """Subscribe an entity that is not yet tracked for the label."""
+        if self._unsub is None:
+            self._unsub = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_state_changed,
+                event_filter=self._async_state_changed_filter,
+            )
+        self._labels.setdefault(entity_id, {})[label_id] = None
+        self._members.setdefault(label_id, {})[entity_id] = None
+
+    @callback
+    def async_remove(self, entity_id: str, label_id: str) -> bool:
+        """Unsubscribe an entity for the label, return False if not subscribed."""
+        if (labels := self._labels.get(entity_id)) is None or label_id not in labels:
+            return False
+
+        LOGGER.debug("No longer tracking %s for label %s", entity_id, label_id)
+        del labels[label_id]
+        if not labels:
+            del self._labels[entity_id]
+
+        members = self._members[label_id]
+        del members[entity_id]
+        if not members:
+            del self._members[label_id]
+
+        if not self._labels and self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        return True
+
+    @callback
+    def _async_state_changed_filter(self, event_data: EventStateChangedData) -> bool:
+        """Filter state changes to the subscribed entities."""
+        return event_data["entity_id"] in self._labels
+
+    @callback
+    def _async_state_changed(self, event: Event[EventStateChangedData]) -> None:
+        """Dispatch a state change for each label its entity is subscribed for."""
+        for label_id in tuple(self._labels.get(event.data["entity_id"], ())):
+            self._action(label_id, event)
+
+    @callback
+    def async_remove_entity(self, entity_id: str) -> set[str]:
+        """Unsubscribe an entity for all labels, return the labels removed."""
+        labels = self.async_labels(entity_id)
+        for label_id in labels:
+            self.async_remove(entity_id, label_id)
+        return labels
+
+    @callback
+    def async_remove_label(self, label_id: str) -> None:
+        """Unsubscribe all entities for the label."""
+        for entity_id in self.async_entity_ids(label_id):
+            self.async_remove(entity_id, label_id)
+
+    @callback
+    def async_resubscribe(self, old_entity_id: str, new_entity_id: str) -> set[str]:
+        """Move the subscriptions of a renamed entity, return the labels moved."""
+        labels = self.async_remove_entity(old_entity_id)
+        for label_id in labels:
+            self.async_add(new_entity_id, label_id)
+        return labels
@@ -0,0 +1,75 @@
+"""Websocket API for label_state."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register the label_state websocket commands."""
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required("entry_id"): str,
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the matching entities of a label_state entry.
+
+    The first event holds every matching entity, the following ones only
+    the entities that were added or removed. The subscription ends with an
+    error when the entry is unloaded, including when it is reloaded, after
+    which the client subscribes again.
+    """
+    entry = hass.config_entries.async_get_entry(msg["entry_id"])
+    if (
+        entry is None
+        or entry.domain != DOMAIN
+        or entry.state is not ConfigEntryState.LOADED
+    ):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry not found"
+        )
+        return
+
+    feed = entry.runtime_data.feed
+
+    @callback
+    def forward_delta(added: dict[str, str], removed: list[str]) -> None:
+        """Forward the entities entering and leaving the match set."""
+        connection.send_message(
+            websocket_api.event_message(msg["id"], {"add": added, "remove": removed})
+        )
+
+    @callback
+    def end_subscription() -> None:
+        """End the subscription as the entry is unloaded."""
+        connection.subscriptions.pop(msg["id"], None)
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Config entry unloaded"
+        )
+
+    connection.subscriptions[msg["id"]] = feed.async_add_listener(
+        forward_delta, end_subscription
+    )
+    connection.send_result(msg["id"])
+    connection.send_message(
+        websocket_api.event_message(msg["id"], {"entities": dict(feed.entities)})
+    )
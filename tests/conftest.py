@@ -20,6 +20,48 @@ from homeassistant.core import HomeAssistant
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
+BENCHMARK_RESULTS = pytest.StashKey[list[tuple[str, str, str]]]()
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Add the option to run the benchmarks."""
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run the label_state benchmarks",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Prepare the benchmark results."""
+    config.stash[BENCHMARK_RESULTS] = []
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip the benchmarks unless they were asked for."""
+    if config.getoption("--run-benchmarks"):
+        return
+
+    skip_benchmark = pytest.mark.skip(reason="Run with --run-benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip_benchmark)
+
+
+def pytest_terminal_summary(
+    terminalreporter: pytest.TerminalReporter, config: pytest.Config
+) -> None:
+    """Report the benchmark results."""
+    if not (results := config.stash[BENCHMARK_RESULTS]):
+        return
+
+    terminalreporter.section("label_state benchmarks")
+    for case, metric, value in results:
+        terminalreporter.write_line(f"{case:<32} {metric:<36} {value:>16}")
+
 
 # This fixture enables loading custom integrations in all tests.
 # Remove to enable selective use of this fixture
@@ -29,6 +71,12 @@ def auto_enable_custom_integrations(enable_custom_integrations):
     return
 
 
+@pytest.fixture
+def benchmark_results(request: pytest.FixtureRequest) -> list[tuple[str, str, str]]:
+    """Return the list benchmark results are reported from."""
+    return request.config.stash[BENCHMARK_RESULTS]
+
+
 @pytest.fixture
 def mock_setup_entry() -> Generator[AsyncMock]:
     """Automatically path uuid generator."""
@@ -0,0 +1,149 @@
+"""Benchmarks for the label_state integration.
+
+These build synthetic registries of labelled entities and report the cost of
+the integration, they are skipped unless pytest is run with
+``--run-benchmarks``, for example:
+
+    pytest tests/test_benchmark.py --run-benchmarks
+"""
+
+from __future__ import annotations
+
+import tracemalloc
+from time import perf_counter
+from typing import Any
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, label_registry as lr
+
+pytestmark = pytest.mark.benchmark
+
+SIZES = [100, 1_000, 10_000]
+EVENT_ROUNDS = 200
+REGISTRY_ROUNDS = 50
+
+# Sensors sharing the benchmark label
+SENSOR_OPTIONS: list[dict[str, Any]] = [
+    {"state_type": "state", "state_to": "unavailable"},
+    {"state_type": "state", "state_to": "unknown"},
+    {"state_type": "state_not", "state_not": "unavailable"},
+    {"state_type": "numeric_state", "state_lower_limit": 20},
+    {"state_type": "numeric_state", "state_upper_limit": 80},
+    {
+        "state_type": "numeric_state",
+        "state_lower_limit": 20,
+        "state_upper_limit": 80,
+    },
+]
+
+
+def _format_ms(seconds: float) -> str:
+    """Format a duration in milliseconds."""
+    return f"{seconds * 1000:.3f} ms"
+
+
+async def _create_labelled_entities(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_id: str,
+    count: int,
+) -> list[str]:
+    """Create labelled entities with a numeric state."""
+    entity_ids = []
+    for index in range(count):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "bench", f"unique_{index}", suggested_object_id=f"bench_{index}"
+        )
+        entity_registry.async_update_entity(entity_entry.entity_id, labels={label_id})
+        hass.states.async_set(entity_entry.entity_id, "50")
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+    return entity_ids
+
+
+@pytest.mark.parametrize("size", SIZES)
+async def test_benchmark(
+    hass: HomeAssistant,
+    size: int,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+    benchmark_results: list[tuple[str, str, str]],
+) -> None:
+    """Benchmark setup, state and registry updates for a label."""
+
+    case = f"{size} entities, {len(SENSOR_OPTIONS)} sensors"
+
+    def report(metric: str, value: str) -> None:
+        benchmark_results.append((case, metric, value))
+
+    test_label = label_registry.async_create("bench")
+    entity_ids = await _create_labelled_entities(
+        hass, entity_registry, test_label.label_id, size
+    )
+
+    # Setup, including the replay of every labelled entity's state
+    tracemalloc.start()
+    start = perf_counter()
+    for index, options in enumerate(SENSOR_OPTIONS):
+        config_entry = MockConfigEntry(
+            domain="label_state",
+            data={},
+            options={"name": f"bench_{index}", "label": test_label.label_id} | options,
+            title=f"bench_{index}",
+        )
+        config_entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    setup_time = perf_counter() - start
+    memory, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    sensor_entity_ids = [
+        f"binary_sensor.bench_{index}" for index in range(len(SENSOR_OPTIONS))
+    ]
+    initial_states = [
+        hass.states.get(entity_id).state for entity_id in sensor_entity_ids
+    ]
+    assert initial_states == ["off", "off", "on", "off", "off", "off"]
+
+    report("setup per sensor", _format_ms(setup_time / len(SENSOR_OPTIONS)))
+    report("memory per sensor", f"{memory / len(SENSOR_OPTIONS) / 1024:.1f} KiB")
+
+    # State changes, each delivered to every sensor of the label
+    entity_id = entity_ids[size // 2]
+    start = perf_counter()
+    for _ in range(EVENT_ROUNDS):
+        hass.states.async_set(entity_id, "10")
+        await hass.async_block_till_done()
+        hass.states.async_set(entity_id, "50")
+        await hass.async_block_till_done()
+    report(
+        "state change latency", _format_ms((perf_counter() - start) / EVENT_ROUNDS / 2)
+    )
+
+    # State changes that do not alter any sensor's result
+    start = perf_counter()
+    for value in range(EVENT_ROUNDS):
+        hass.states.async_set(entity_id, str(40 + value % 20))
+        await hass.async_block_till_done()
+    report(
+        "unchanged result latency", _format_ms((perf_counter() - start) / EVENT_ROUNDS)
+    )
+
+    # Label edits, each adding or removing one entity from the label
+    start = perf_counter()
+    for _ in range(REGISTRY_ROUNDS):
+        entity_registry.async_update_entity(entity_id, labels=set())
+        await hass.async_block_till_done()
+        entity_registry.async_update_entity(entity_id, labels={test_label.label_id})
+        await hass.async_block_till_done()
+    report(
+        "label edit latency", _format_ms((perf_counter() - start) / REGISTRY_ROUNDS / 2)
+    )
+
+    assert [
+        hass.states.get(entity_id).state for entity_id in sensor_entity_ids
+    ] == initial_states
@@ -1,10 +1,23 @@
 """The test for the label_state binary sensor platform."""
 
+from datetime import timedelta
+
 import pytest
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+    async_fire_time_changed,
+)
 
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers import entity_registry as er, label_registry as lr
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, EVENT_STATE_CHANGED
+from homeassistant.core import CoreState, HomeAssistant
+from homeassistant.helpers import (
+    area_registry as ar,
+    device_registry as dr,
+    entity_registry as er,
+    label_registry as lr,
+)
 from homeassistant.setup import async_setup_component
 
 from . import setup_integration
@@ -253,6 +266,13 @@ async def test_state_not_sensor(
         ("1", "12", 10, None, "on"),
         ("1", "19", None, 20, "off"),
         ("1", "22", None, 20, "on"),
+        ("-1", "12", 0, None, "on"),
+        ("abc", "12", 10, 20, "unknown"),
+        ("abc", "1", 10, 20, "on"),
+        ("inf", "12", None, 20, "on"),
+        ("nan", "12", None, 20, "off"),
+        ("-inf", "12", None, 20, "off"),
+        ("-inf", "12", 10, None, "on"),
     ],
 )
 async def test_numeric_state_sensor(
@@ -264,6 +284,7 @@ async def test_numeric_state_sensor(
     expected_state: str,
     entity_registry: er.EntityRegistry,
     label_registry: lr.LabelRegistry,
+    caplog: pytest.LogCaptureFixture,
 ) -> None:
     """Test the numeric state sensor."""
 
@@ -321,3 +342,1130 @@ async def test_numeric_state_sensor(
 
     assert state is not None
     assert state.state == expected_state
+
+    # Only states that are not numbers are reported, nan and inf are numbers
+    assert ("Only numerical states are supported" in caplog.text) == (state_1 == "abc")
+
+
+async def test_state_sensor_match_set(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the entities attribute follows individual state changes."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, "on")
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+    hass.states.async_set(entity_ids[2], "unavailable")
+    hass.states.async_set(entity_ids[0], "unavailable")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.state == "on"
+    assert state.attributes["entities"] == [entity_ids[2], entity_ids[0]]
+    assert state.attributes["entity_names"] == [entity_ids[2], entity_ids[0]]
+
+    hass.states.async_set(entity_ids[2], "on")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.state == "on"
+    assert state.attributes["entities"] == [entity_ids[0]]
+
+    # Removing the label drops the entity from the match set
+    entity_registry.async_update_entity(entity_ids[0], labels=set())
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+
+async def test_entity_names_follow_registry(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the entity names are refreshed when the registries change."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    source_config_entry = MockConfigEntry()
+    source_config_entry.add_to_hass(hass)
+    device_entry = device_registry.async_get_or_create(
+        config_entry_id=source_config_entry.entry_id,
+        identifiers={("sensor", "test_device")},
+        name="Device",
+    )
+    entity_entry = entity_registry.async_get_or_create(
+        "sensor",
+        "test",
+        "unique",
+        suggested_object_id="test_1",
+        config_entry=source_config_entry,
+        device_id=device_entry.id,
+        original_name="Battery",
+    )
+    entity_registry.async_update_entity(
+        entity_entry.entity_id, labels={test_label.label_id}
+    )
+    hass.states.async_set(entity_entry.entity_id, "unavailable")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.attributes["entity_names"] == ["Device (Battery)"]
+
+    device_registry.async_update_device(device_entry.id, name_by_user="Kitchen")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.attributes["entity_names"] == ["Kitchen (Battery)"]
+
+    entity_registry.async_update_entity(entity_entry.entity_id, name="Cell")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state is not None
+    assert state.attributes["entity_names"] == ["Kitchen (Cell)"]
+
+
+async def test_state_sensor_update_delay(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test a burst of state changes is written as a single update."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index in range(10):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, "on")
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+            "max_update_delay": 5,
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "unavailable")
+        await hass.async_block_till_done()
+
+    sensor_events = [
+        event
+        for event in events
+        if event.data["entity_id"] == "binary_sensor.test_state"
+    ]
+    assert sensor_events == []
+    assert hass.states.get("binary_sensor.test_state").state == "off"
+
+    freezer.tick(timedelta(seconds=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    sensor_events = [
+        event
+        for event in events
+        if event.data["entity_id"] == "binary_sensor.test_state"
+    ]
+    assert len(sensor_events) == 1
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == entity_ids
+
+
+async def test_numeric_state_sensor_skips_unchanged_writes(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the state is not written when the result did not change."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test", "unique", suggested_object_id="test_1"
+    )
+    entity_registry.async_update_entity(
+        entity_entry.entity_id, labels={test_label.label_id}
+    )
+    hass.states.async_set(entity_entry.entity_id, "50")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_numeric_state",
+            "label": test_label.label_id,
+            "state_type": "numeric_state",
+            "state_lower_limit": 20,
+        },
+        title="test_numeric_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    changed_events = async_capture_events(hass, EVENT_STATE_CHANGED)
+    initial_state = hass.states.get("binary_sensor.test_numeric_state")
+
+    for value in ("49", "48", "47"):
+        hass.states.async_set(entity_entry.entity_id, value)
+        await hass.async_block_till_done()
+
+    # Neither changed nor reported
+    state = hass.states.get("binary_sensor.test_numeric_state")
+    assert state.last_reported == initial_state.last_reported
+    assert [
+        event
+        for event in changed_events
+        if event.data["entity_id"] == "binary_sensor.test_numeric_state"
+    ] == []
+
+    hass.states.async_set(entity_entry.entity_id, "10")
+    await hass.async_block_till_done()
+
+    assert [
+        event.data["new_state"].state
+        for event in changed_events
+        if event.data["entity_id"] == "binary_sensor.test_numeric_state"
+    ] == ["on"]
+
+
+async def test_state_sensor_deferred_until_started(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the sensor is only evaluated after startup and its grace period."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index in range(2):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    hass.set_state(CoreState.not_running)
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+            "startup_grace_period": 30,
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    # Entities coming online during startup are not evaluated
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "unavailable")
+        await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").state == "unknown"
+
+    hass.set_state(CoreState.running)
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await hass.async_block_till_done()
+
+    hass.states.async_set(entity_ids[0], "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").state == "unknown"
+
+    freezer.tick(timedelta(seconds=30))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    sensor_events = [
+        event
+        for event in events
+        if event.data["entity_id"] == "binary_sensor.test_state"
+    ]
+    assert len(sensor_events) == 1
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == [entity_ids[1]]
+
+    # Once evaluated, state changes are handled as they arrive
+    hass.states.async_set(entity_ids[1], "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").state == "off"
+
+
+async def test_state_sensor_label_expression(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test entities are selected by all and excluded labels."""
+
+    battery_label = label_registry.async_create("battery")
+    outdoor_label = label_registry.async_create("outdoor")
+    ignored_label = label_registry.async_create("ignored")
+
+    entity_labels = {
+        "sensor.test_0": {battery_label.label_id, outdoor_label.label_id},
+        "sensor.test_1": {battery_label.label_id},
+        "sensor.test_2": {
+            battery_label.label_id,
+            outdoor_label.label_id,
+            ignored_label.label_id,
+        },
+        "sensor.test_3": {outdoor_label.label_id},
+    }
+    for index, (entity_id, labels) in enumerate(entity_labels.items()):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        assert entity_entry.entity_id == entity_id
+        entity_registry.async_update_entity(entity_id, labels=labels)
+        hass.states.async_set(entity_id, "unavailable")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": battery_label.label_id,
+            "labels_all": [outdoor_label.label_id],
+            "labels_not": [ignored_label.label_id],
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == ["sensor.test_0"]
+
+    # Gaining the excluded label removes an entity
+    entity_registry.async_update_entity(
+        "sensor.test_0", labels=entity_labels["sensor.test_2"]
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+    # Gaining the required label adds an entity
+    entity_registry.async_update_entity(
+        "sensor.test_1", labels=entity_labels["sensor.test_0"]
+    )
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == ["sensor.test_1"]
+
+    # State changes of entities that are not selected are ignored
+    hass.states.async_set("sensor.test_0", "on")
+    hass.states.async_set("sensor.test_3", "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        "sensor.test_1"
+    ]
+
+
+async def test_state_sensor_for_duration(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test entities only match once they have matched for the duration."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, "on")
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+            "state_for": {"minutes": 10},
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    hass.states.async_set(entity_ids[0], "unavailable")
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(minutes=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    hass.states.async_set(entity_ids[1], "unavailable")
+    hass.states.async_set(entity_ids[2], "unavailable")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").state == "off"
+
+    # Recovering before the duration cancels the entity's deadline
+    freezer.tick(timedelta(minutes=1))
+    async_fire_time_changed(hass)
+    hass.states.async_set(entity_ids[2], "on")
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(minutes=4))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == [entity_ids[0]]
+
+    freezer.tick(timedelta(minutes=5))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        entity_ids[0],
+        entity_ids[1],
+    ]
+
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        entity_ids[0],
+        entity_ids[1],
+    ]
+
+    # A matched entity that recovers stops matching immediately
+    hass.states.async_set(entity_ids[0], "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        entity_ids[1]
+    ]
+
+
+async def test_state_sensor_for_duration_reload(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test entities already matching for the duration match on a reload."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        entity_ids.append(entity_entry.entity_id)
+    hass.states.async_set(entity_ids[0], "unavailable")
+    hass.states.async_set(entity_ids[1], "unavailable")
+    hass.states.async_set(entity_ids[2], "on")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+            "state_for": {"minutes": 10},
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(hours=3))
+    async_fire_time_changed(hass)
+    hass.states.async_set(entity_ids[2], "unavailable")
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, "label_state_entity_changed")
+
+    assert await hass.config_entries.async_reload(config.entry_id)
+    await hass.async_block_till_done()
+
+    # The entities unavailable for hours match at once and are not reported
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == entity_ids[:2]
+    assert events == []
+
+    # The entity that only just became unavailable still waits the duration
+    freezer.tick(timedelta(minutes=10))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert (
+        hass.states.get("binary_sensor.test_state").attributes["entities"] == entity_ids
+    )
+    assert [event.data["entity_id"] for event in events] == [entity_ids[2]]
+
+
+async def test_state_sensor_inherited_labels(
+    hass: HomeAssistant,
+    area_registry: ar.AreaRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test entities are included by the labels of their device and area."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+    kitchen = area_registry.async_create("Kitchen")
+    garage = area_registry.async_create("Garage")
+
+    source_config_entry = MockConfigEntry()
+    source_config_entry.add_to_hass(hass)
+
+    devices = [
+        device_registry.async_get_or_create(
+            config_entry_id=source_config_entry.entry_id,
+            identifiers={("test", f"device_{index}")},
+            name=f"Device {index}",
+        )
+        for index in range(2)
+    ]
+
+    entity_ids = []
+    for index, device in enumerate([devices[0], devices[1], devices[1]]):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor",
+            "test",
+            f"unique_{index}",
+            suggested_object_id=f"test_{index}",
+            device_id=device.id,
+        )
+        hass.states.async_set(entity_entry.entity_id, "unavailable")
+        entity_ids.append(entity_entry.entity_id)
+
+    # The last entity has its own area, so does not inherit its device's area
+    entity_registry.async_update_entity(entity_ids[2], area_id=garage.id)
+    device_registry.async_update_device(devices[0].id, labels={test_label.label_id})
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "inherit_labels": True,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        entity_ids[0]
+    ]
+
+    # Labelling an area includes the entities of the devices in it
+    area_registry.async_update(kitchen.id, labels={test_label.label_id})
+    device_registry.async_update_device(devices[1].id, area_id=kitchen.id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        entity_ids[0],
+        entity_ids[1],
+    ]
+
+    hass.states.async_set(entity_ids[1], "on")
+    hass.states.async_set(entity_ids[2], "on")
+    await hass.async_block_till_done()
+    hass.states.async_set(entity_ids[1], "unavailable")
+    hass.states.async_set(entity_ids[2], "unavailable")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        entity_ids[0],
+        entity_ids[1],
+    ]
+
+    # Removing the labels removes the entities
+    device_registry.async_update_device(devices[0].id, labels=set())
+    area_registry.async_update(kitchen.id, labels=set())
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+
+async def test_state_sensors_inheriting_and_plain(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test a plain sensor ignores entities subscribed for an inheriting one."""
+
+    test_label = label_registry.async_create("test")
+
+    source_config_entry = MockConfigEntry()
+    source_config_entry.add_to_hass(hass)
+    device = device_registry.async_get_or_create(
+        config_entry_id=source_config_entry.entry_id,
+        identifiers={("test", "device")},
+    )
+    device_registry.async_update_device(device.id, labels={test_label.label_id})
+    entity_registry.async_get_or_create(
+        "sensor",
+        "test",
+        "unique_dev",
+        suggested_object_id="dev_ent",
+        device_id=device.id,
+    )
+    labelled_entry = entity_registry.async_get_or_create(
+        "sensor", "test", "unique_labelled", suggested_object_id="labelled"
+    )
+    entity_registry.async_update_entity(
+        labelled_entry.entity_id, labels={test_label.label_id}
+    )
+    hass.states.async_set("sensor.dev_ent", "unavailable")
+    hass.states.async_set("sensor.labelled", "on")
+    await hass.async_block_till_done()
+
+    for name, inherit_labels in (("test_inherit", True), ("test_plain", False)):
+        config = MockConfigEntry(
+            domain="label_state",
+            data={},
+            options={
+                "name": name,
+                "label": test_label.label_id,
+                "inherit_labels": inherit_labels,
+                "state_type": "state",
+                "state_to": ["unavailable"],
+            },
+            title=name,
+        )
+        await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_inherit")
+    assert state.state == "on"
+    assert state.attributes["entities"] == ["sensor.dev_ent"]
+
+    state = hass.states.get("binary_sensor.test_plain")
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+    # Only the labelled entity changes the plain sensor
+    hass.states.async_set("sensor.dev_ent", "on")
+    hass.states.async_set("sensor.dev_ent", "unavailable")
+    hass.states.async_set("sensor.labelled", "unavailable")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_plain").attributes["entities"] == [
+        "sensor.labelled"
+    ]
+
+
+@pytest.mark.parametrize(
+    ("state_type", "options", "expected_entities"),
+    [
+        (
+            "state",
+            {"state_to": ["open", "Jammed*"]},
+            ["sensor.test_0", "sensor.test_1"],
+        ),
+        (
+            "state",
+            {"state_to": ["open"], "state_pattern": r"error_\d+"},
+            ["sensor.test_0", "sensor.test_3"],
+        ),
+        (
+            "state_not",
+            {"state_not": ["closed", "OPEN"], "state_pattern": "jammed_.*"},
+            ["sensor.test_3"],
+        ),
+        (
+            "state",
+            {"state_to": ["Jammed*"], "state_pattern": r"(?i)ERROR_\d+"},
+            ["sensor.test_1", "sensor.test_3"],
+        ),
+        (
+            "state",
+            {"state_pattern": "(?x) open | closed"},
+            ["sensor.test_0", "sensor.test_2"],
+        ),
+    ],
+)
+async def test_state_sensor_multiple_states(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+    state_type: str,
+    options: dict[str, list[str] | str],
+    expected_entities: list[str],
+) -> None:
+    """Test matching any of several states, glob patterns and a regex."""
+
+    test_label = label_registry.async_create("test")
+
+    for index, entity_state in enumerate(["open", "jammed_left", "closed", "error_42"]):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, entity_state)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": state_type,
+        }
+        | options,
+        title="test_state",
+        minor_version=2,
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == expected_entities
+
+
+async def test_numeric_state_sensor_attribute(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test matching on an attribute, ignoring updates of other attributes."""
+
+    test_label = label_registry.async_create("test")
+
+    for index in range(2):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+    hass.states.async_set("sensor.test_0", "on", {"battery_level": 80})
+    hass.states.async_set("sensor.test_1", "on", {"battery_level": 10})
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "attribute": "battery_level",
+            "state_type": "numeric_state",
+            "state_lower_limit": 20,
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == ["sensor.test_1"]
+
+    # Updates of other attributes are ignored
+    hass.states.async_set("sensor.test_1", "on", {"battery_level": 10, "rssi": -70})
+    await hass.async_block_till_done()
+
+    stats = config.runtime_data.stats
+    assert stats.events_ignored == 1
+
+    # The watched attribute changing is evaluated
+    hass.states.async_set("sensor.test_1", "on", {"battery_level": 90})
+    hass.states.async_set("sensor.test_0", "on", {"battery_level": 5})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == ["sensor.test_0"]
+    assert stats.events_ignored == 1
+
+    # An unavailable entity has no attribute to match
+    hass.states.async_set("sensor.test_0", "unavailable")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+
+async def test_state_sensor_max_entities(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the attributes list a limited number of entities."""
+
+    test_label = label_registry.async_create("test")
+
+    entity_ids = []
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        entity_ids.append(entity_entry.entity_id)
+        hass.states.async_set(entity_entry.entity_id, "unavailable")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": ["unavailable"],
+            "max_entities": 2,
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "on"
+    assert state.attributes["entities"] == entity_ids[:2]
+    assert state.attributes["entity_names"] == entity_ids[:2]
+    assert state.attributes["entity_count"] == len(entity_ids)
+
+    # The full list is returned by the service
+    response = await hass.services.async_call(
+        "label_state",
+        "get_matches",
+        {"entity_id": "binary_sensor.test_state"},
+        blocking=True,
+        return_response=True,
+    )
+    matches = response["binary_sensor.test_state"]["matches"]
+    assert response["binary_sensor.test_state"]["entity_count"] == len(entity_ids)
+    assert [match["entity_id"] for match in matches] == entity_ids
+
+    # Entities keep their place in the list as others leave
+    hass.states.async_set(entity_ids[0], "on")
+    await hass.async_block_till_done()
+
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.attributes["entities"] == entity_ids[1:]
+    assert state.attributes["entity_count"] == len(entity_ids) - 1
+
+
+async def test_state_sensor_entity_changed_events(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test an event is fired as single entities match and unmatch."""
+
+    test_label = label_registry.async_create("test")
+
+    for index in range(2):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+    hass.states.async_set("sensor.test_0", "unavailable")
+    hass.states.async_set("sensor.test_1", "on")
+    await hass.async_block_till_done()
+
+    events = async_capture_events(hass, "label_state_entity_changed")
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": ["unavailable"],
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    # The initial match set is not reported
+    assert events == []
+
+    hass.states.async_set("sensor.test_1", "unavailable")
+    hass.states.async_set("sensor.test_0", "on")
+    hass.states.async_set("sensor.test_0", "off")
+    await hass.async_block_till_done()
+
+    assert [event.data for event in events] == [
+        {
+            "config_entry_id": config.entry_id,
+            "label_state_entity_id": "binary_sensor.test_state",
+            "entity_id": "sensor.test_1",
+            "matched": True,
+        },
+        {
+            "config_entry_id": config.entry_id,
+            "label_state_entity_id": "binary_sensor.test_state",
+            "entity_id": "sensor.test_0",
+            "matched": False,
+        },
+    ]
+
+
+async def test_state_sensors_from_yaml_list(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a list of sensors set up from one platform block."""
+
+    labels = [label_registry.async_create(f"test_{index}") for index in range(2)]
+
+    for index, label in enumerate(labels):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={label.label_id}
+        )
+    hass.states.async_set("sensor.test_0", "unavailable")
+    hass.states.async_set("sensor.test_1", "on")
+    await hass.async_block_till_done()
+
+    config = {
+        "binary_sensor": {
+            "platform": "label_state",
+            "name": "ignored",
+            "unique_id": "block",
+            "state_type": "state",
+            "state_to": "unavailable",
+            "sensors": [
+                {
+                    "name": "test_unavailable_0",
+                    "unique_id": "unavailable_0",
+                    "label": labels[0].label_id,
+                },
+                {"name": "test_unavailable_1", "label": labels[1].label_id},
+                {
+                    "name": "test_on_1",
+                    "label": labels[1].label_id,
+                    "state_to": "on",
+                },
+            ],
+        }
+    }
+
+    assert await async_setup_component(hass, "binary_sensor", config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_unavailable_0").state == "on"
+    assert hass.states.get("binary_sensor.test_unavailable_1").state == "off"
+    assert hass.states.get("binary_sensor.test_on_1").state == "on"
+    assert "Set up 3 label_state sensors for 2 labels" in caplog.text
+
+    # The name and unique_id of the block are not given to its sensors
+    assert hass.states.get("binary_sensor.ignored") is None
+    assert (
+        entity_registry.async_get_entity_id("binary_sensor", "label_state", "block")
+        is None
+    )
+    assert (
+        entity_registry.async_get_entity_id(
+            "binary_sensor", "label_state", "unavailable_0"
+        )
+        == "binary_sensor.test_unavailable_0"
+    )
+
+
+@pytest.mark.parametrize(
+    "sensor_config",
+    [
+        {"name": "test_no_label", "state_type": "state", "state_to": "on"},
+        {"name": "test_no_state_type", "label": "test", "state_to": "on"},
+        {
+            "name": "test_bad_pattern",
+            "label": "test",
+            "state_type": "state",
+            "state_pattern": "(",
+        },
+    ],
+)
+async def test_state_sensors_from_yaml_list_invalid(
+    hass: HomeAssistant,
+    sensor_config: dict[str, str],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test an invalid sensor in a list is reported as a config error."""
+
+    config = {
+        "binary_sensor": {
+            "platform": "label_state",
+            "sensors": [sensor_config],
+        }
+    }
+
+    assert await async_setup_component(hass, "binary_sensor", config)
+    await hass.async_block_till_done()
+
+    assert hass.states.async_entity_ids("binary_sensor") == []
+    assert "Invalid config for 'binary_sensor' from integration 'label_state'" in (
+        caplog.text
+    )
@@ -9,6 +9,7 @@ from custom_components.label_state.const import (
     CONF_LABEL,
     CONF_STATE_LOWER_LIMIT,
     CONF_STATE_NOT,
+    CONF_STATE_PATTERN,
     CONF_STATE_TO,
     CONF_STATE_TYPE,
     CONF_STATE_UPPER_LIMIT,
@@ -36,7 +37,7 @@ from homeassistant.data_entry_flow import FlowResultType
             "Unavailable",
             "state",
             "my_label",
-            "unavailable",
+            ["unavailable"],
             None,
             None,
             None,
@@ -46,7 +47,7 @@ from homeassistant.data_entry_flow import FlowResultType
             "state_not",
             "my_label",
             None,
-            "on",
+            ["on"],
             None,
             None,
         ),
@@ -66,8 +67,8 @@ async def test_config_flow(
     name: str,
     state_type: str,
     label: str,
-    state_to: str | None,
-    state_not: str | None,
+    state_to: list[str] | None,
+    state_not: list[str] | None,
     state_lower_limit: float | None,
     state_upper_limit: float | None,
     mock_setup_entry: AsyncMock,
@@ -143,3 +144,53 @@ async def test_config_flow(
         }
 
     assert len(mock_setup_entry.mock_calls) == 1
+
+
+@pytest.mark.parametrize(
+    ("state_type", "user_input", "error"),
+    [
+        ("state", {CONF_STATE_PATTERN: "(?i)jam.*"}, None),
+        ("state_not", {CONF_STATE_PATTERN: "(?i)ok|fine"}, None),
+        ("state", {CONF_STATE_TO: ["on"], CONF_STATE_PATTERN: "("}, "invalid_pattern"),
+        ("state", {}, "states_or_pattern_not_specified"),
+        ("state_not", {CONF_STATE_NOT: []}, "states_or_pattern_not_specified"),
+    ],
+)
+async def test_config_flow_states_or_pattern(
+    hass: HomeAssistant,
+    state_type: str,
+    user_input: dict[str, str | list[str]],
+    error: str | None,
+    mock_setup_entry: AsyncMock,
+) -> None:
+    """Test state sensors need states or a pattern that compiles."""
+
+    menu_step = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": config_entries.SOURCE_USER}
+    )
+    form_step = await hass.config_entries.flow.async_configure(
+        menu_step["flow_id"],
+        {"next_step_id": state_type},
+    )
+
+    result = await hass.config_entries.flow.async_configure(
+        form_step["flow_id"],
+        {CONF_NAME: "Test", CONF_LABEL: "my_label"} | user_input,
+    )
+    await hass.async_block_till_done()
+
+    if error is None:
+        assert result.get("type") is FlowResultType.CREATE_ENTRY
+        assert (
+            result.get("options")
+            == {
+                CONF_NAME: "Test",
+                CONF_STATE_TYPE: state_type,
+                CONF_LABEL: "my_label",
+            }
+            | user_input
+        )
+        assert len(mock_setup_entry.mock_calls) == 1
+    else:
+        assert result.get("type") is FlowResultType.FORM
+        assert result.get("errors") == {"base": error}
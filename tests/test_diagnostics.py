@@ -0,0 +1,110 @@
+"""The test for the label_state diagnostics."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.components.diagnostics import (
+    get_diagnostics_for_config_entry,
+)
+from pytest_homeassistant_custom_component.typing import ClientSessionGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, label_registry as lr
+
+from . import setup_integration
+
+# The two state changes, the startup seeding is not a state change event
+EVENTS_PROCESSED = 2
+
+
+async def test_diagnostics(
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the diagnostics counters of a sensor."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    sensor1_entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test_1", "unique", suggested_object_id="test_1"
+    )
+    entity_registry.async_update_entity(
+        sensor1_entity_entry.entity_id, labels={test_label.label_id}
+    )
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+
+    hass.states.async_set(sensor1_entity_entry.entity_id, "unavailable")
+    await hass.async_block_till_done()
+    hass.states.async_set(
+        sensor1_entity_entry.entity_id, "unavailable", {"attribute": "changed"}
+    )
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_state").state == "on"
+
+    diagnostics = await get_diagnostics_for_config_entry(hass, hass_client, config)
+
+    assert diagnostics["options"] == dict(config.options)
+    assert diagnostics["hub"] == {
+        "label_listeners": 1,
+        "label_subscriptions": 1,
+        "total_subscriptions": 1,
+    }
+
+    stats = diagnostics["stats"]
+    assert stats["tracked_entities"] == 1
+    assert stats["events_processed"] == EVENTS_PROCESSED
+    assert stats["writes_emitted"] == 1
+    assert stats["writes_suppressed"] == 1
+    assert stats["state_change_latency"]["count"] == EVENTS_PROCESSED
+    assert sum(stats["state_change_latency"]["buckets"].values()) == EVENTS_PROCESSED
+
+
+async def test_debug_sensors_disabled_by_default(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the debug sensors are created disabled."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+
+    entity_id = entity_registry.async_get_entity_id(
+        "sensor", "label_state", f"{config.entry_id}_events_processed"
+    )
+    assert entity_id is not None
+    entity_entry = entity_registry.async_get(entity_id)
+    assert entity_entry.disabled_by is er.RegistryEntryDisabler.INTEGRATION
+    assert hass.states.get(entity_id) is None
@@ -0,0 +1,310 @@
+"""The test for the label_state hub."""
+
+from custom_components.label_state.hub import async_get_hub
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er, label_registry as lr
+from homeassistant.helpers.event import _TRACK_STATE_CHANGE_DATA
+
+from . import setup_integration
+
+
+async def test_shared_subscription(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test sensors on the same label share one subscription per entity."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    sensor_entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test_1", "unique", suggested_object_id="test_1"
+    )
+    entity_registry.async_update_entity(
+        sensor_entity_entry.entity_id, labels={test_label.label_id}
+    )
+    await hass.async_block_till_done()
+
+    for name, state_type, option in (
+        ("test_unavailable", "state", {"state_to": "unavailable"}),
+        ("test_not_on", "state_not", {"state_not": "on"}),
+    ):
+        config = MockConfigEntry(
+            domain="label_state",
+            data={},
+            options={
+                "name": name,
+                "label": test_label.label_id,
+                "state_type": state_type,
+            }
+            | option,
+            title=name,
+        )
+        await setup_integration(hass, config)
+
+    hub = async_get_hub(hass)
+    assert hub.async_listener_count(test_label.label_id) == len(
+        hass.config_entries.async_entries("label_state")
+    )
+    assert hub.async_tracked_entity_ids(test_label.label_id) == ["sensor.test_1"]
+
+    hass.states.async_set("sensor.test_1", "unavailable")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_unavailable").state == "on"
+    assert hass.states.get("binary_sensor.test_not_on").state == "on"
+
+    hass.states.async_set("sensor.test_1", "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.test_unavailable").state == "off"
+    assert hass.states.get("binary_sensor.test_not_on").state == "off"
+
+    # Unloading the last sensor of the label drops the subscriptions
+    for entry in hass.config_entries.async_entries("label_state"):
+        assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hub.async_listener_count(test_label.label_id) == 0
+    assert hub.async_tracked_entity_ids(test_label.label_id) == []
+
+
+class MockListener:
+    """Record the updates dispatched for a label."""
+
+    def __init__(self) -> None:
+        """Initialize the listener."""
+        self.state_events: list[Event] = []
+        self.entity_registry_events: list[Event] = []
+        self.label_registry_events: list[Event] = []
+
+    @callback
+    def async_state_changed(self, event: Event) -> None:
+        """Record a state change."""
+        self.state_events.append(event)
+
+    @callback
+    def async_entity_registry_updated(self, event: Event) -> None:
+        """Record an entity registry update."""
+        self.entity_registry_events.append(event)
+
+    @callback
+    def async_label_registry_updated(self, event: Event) -> None:
+        """Record a label registry update."""
+        self.label_registry_events.append(event)
+
+
+async def test_registry_dispatch(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test registry updates are only dispatched to the affected labels."""
+
+    watched_label = label_registry.async_create("watched")
+    other_label = label_registry.async_create("other")
+
+    sensor_entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test_1", "unique", suggested_object_id="test_1"
+    )
+    await hass.async_block_till_done()
+
+    listener = MockListener()
+    hub = async_get_hub(hass)
+    unsub = hub.async_add_listener(watched_label.label_id, listener)
+
+    # Changes to other labels are not dispatched
+    entity_registry.async_update_entity(
+        sensor_entity_entry.entity_id, labels={other_label.label_id}
+    )
+    label_registry.async_update(other_label.label_id, name="other renamed")
+    await hass.async_block_till_done()
+
+    assert listener.entity_registry_events == []
+    assert listener.label_registry_events == []
+
+    # Adding the label dispatches and subscribes the entity
+    entity_registry.async_update_entity(
+        sensor_entity_entry.entity_id,
+        labels={other_label.label_id, watched_label.label_id},
+    )
+    await hass.async_block_till_done()
+
+    assert len(listener.entity_registry_events) == 1
+    assert hub.async_tracked_entity_ids(watched_label.label_id) == ["sensor.test_1"]
+
+    hass.states.async_set("sensor.test_1", "on")
+    await hass.async_block_till_done()
+
+    assert len(listener.state_events) == 1
+
+    # Other label changes of a subscribed entity are dispatched, as label
+    # expressions depend on them, while updates of other labels are not
+    entity_registry.async_update_entity(
+        sensor_entity_entry.entity_id, labels={watched_label.label_id}
+    )
+    entity_registry.async_update_entity(sensor_entity_entry.entity_id, name="Renamed")
+    label_registry.async_update(other_label.label_id, name="other renamed again")
+    label_registry.async_update(watched_label.label_id, name="watched renamed")
+    await hass.async_block_till_done()
+
+    assert [event.data["action"] for event in listener.entity_registry_events] == [
+        "update",
+        "update",
+    ]
+    assert len(listener.label_registry_events) == 1
+
+    unsub()
+
+
+async def test_subscription_lifecycle(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test subscriptions follow relabelling, renames and removals."""
+
+    test_label = label_registry.async_create("test")
+    other_label = label_registry.async_create("other")
+
+    sensor_entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test_1", "unique", suggested_object_id="test_1"
+    )
+    entity_registry.async_update_entity(
+        sensor_entity_entry.entity_id, labels={test_label.label_id}
+    )
+    hass.states.async_set("sensor.test_1", "unavailable")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+    await setup_integration(hass, config)
+
+    hub = async_get_hub(hass)
+    assert hub.async_tracked_entity_ids(test_label.label_id) == ["sensor.test_1"]
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        "sensor.test_1"
+    ]
+
+    # Relabelling does not add a second subscription
+    entity_registry.async_update_entity(
+        "sensor.test_1", labels={test_label.label_id, other_label.label_id}
+    )
+    await hass.async_block_till_done()
+    assert hub.async_subscription_count() == 1
+
+    # Renaming moves the subscription and the match
+    entity_registry.async_update_entity("sensor.test_1", new_entity_id="sensor.renamed")
+    hass.states.async_set("sensor.renamed", "unavailable")
+    await hass.async_block_till_done()
+
+    assert hub.async_tracked_entity_ids(test_label.label_id) == ["sensor.renamed"]
+    assert hass.states.get("binary_sensor.test_state").attributes["entities"] == [
+        "sensor.renamed"
+    ]
+
+    # Removing the label drops the subscription and the match
+    entity_registry.async_update_entity("sensor.renamed", labels={other_label.label_id})
+    await hass.async_block_till_done()
+
+    assert hub.async_tracked_entity_ids(test_label.label_id) == []
+    state = hass.states.get("binary_sensor.test_state")
+    assert state.state == "off"
+    assert state.attributes["entities"] == []
+
+    # Removing the entity from the registry drops the subscription
+    entity_registry.async_update_entity("sensor.renamed", labels={test_label.label_id})
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.test_state").state == "on"
+
+    entity_registry.async_remove("sensor.renamed")
+    await hass.async_block_till_done()
+
+    assert hub.async_tracked_entity_ids(test_label.label_id) == []
+    assert hub.async_subscription_count() == 0
+    assert hass.states.get("binary_sensor.test_state").state == "off"
+
+
+async def test_bulk_subscription(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test entities subscribed together can leave and rejoin the label."""
+
+    def listener_count() -> int:
+        """Return the number of state changed listeners."""
+        return hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    test_label = label_registry.async_create("test")
+
+    entity_ids = []
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    listener = MockListener()
+    hub = async_get_hub(hass)
+    listeners = listener_count()
+    unsub = hub.async_add_listener(test_label.label_id, listener)
+
+    # The entities share a single state changed listener, not one keyed
+    # tracker each
+    assert listener_count() == listeners + 1
+    assert not hass.data.get(_TRACK_STATE_CHANGE_DATA)
+
+    assert hub.async_tracked_entity_ids(test_label.label_id) == entity_ids
+    assert hub.async_seed_states(test_label.label_id) == dict.fromkeys(
+        entity_ids, "unknown"
+    )
+
+    # An entity leaving the label is no longer dispatched
+    entity_registry.async_update_entity(entity_ids[0], labels=set())
+    await hass.async_block_till_done()
+    assert hub.async_tracked_entity_ids(test_label.label_id) == entity_ids[1:]
+
+    for entity_id in entity_ids:
+        hass.states.async_set(entity_id, "on")
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in listener.state_events] == entity_ids[
+        1:
+    ]
+
+    # Rejoining the label is dispatched once
+    listener.state_events.clear()
+    entity_registry.async_update_entity(entity_ids[0], labels={test_label.label_id})
+    await hass.async_block_till_done()
+    assert hub.async_tracked_entity_ids(test_label.label_id) == entity_ids
+    assert listener_count() == listeners + 1
+
+    hass.states.async_set(entity_ids[0], "off")
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in listener.state_events] == [
+        entity_ids[0]
+    ]
+
+    unsub()
+    assert hub.async_subscription_count() == 0
+    assert listener_count() == listeners
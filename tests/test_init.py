@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from custom_components.label_state.const import DOMAIN
+from custom_components.label_state.const import CONFIG_MINOR_VERSION, DOMAIN
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from homeassistant.config_entries import ConfigEntryState
@@ -83,3 +83,28 @@ async def test_setup(
     # Remove the config entry
     assert await hass.config_entries.async_remove(label_state_config_entry.entry_id)
     await hass.async_block_till_done()
+
+
+async def test_migrate_entry(hass: HomeAssistant) -> None:
+    """Test the state options of an old entry are migrated to lists."""
+
+    config_entry = MockConfigEntry(
+        data={},
+        domain=DOMAIN,
+        options={
+            "name": DEFAULT_NAME,
+            "label": "test",
+            "state_type": "state",
+            "state_to": "on",
+        },
+        title=DEFAULT_NAME,
+        version=1,
+        minor_version=1,
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert config_entry.minor_version == CONFIG_MINOR_VERSION
+    assert config_entry.options["state_to"] == ["on"]
@@ -0,0 +1,236 @@
+"""The test for the label_state sensor platform."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, label_registry as lr
+
+from . import setup_integration
+
+
+async def test_aggregate_sensors(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the aggregates follow the numeric states of the label."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index, value in enumerate(["10", "20", "20", "abc"]):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, value)
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_numeric",
+            "label": test_label.label_id,
+            "state_type": "numeric_state",
+            "state_upper_limit": 50,
+            "aggregates": ["min", "max", "mean", "median", "count"],
+        },
+        title="test_numeric",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    def aggregates() -> dict[str, str]:
+        return {
+            aggregate: hass.states.get(f"sensor.test_numeric_{aggregate}").state
+            for aggregate in ("min", "max", "mean", "median", "count")
+        }
+
+    assert aggregates() == {
+        "min": "10.0",
+        "max": "20.0",
+        "mean": "16.6666666666667",
+        "median": "20.0",
+        "count": "3",
+    }
+
+    hass.states.async_set(entity_ids[1], "70")
+    hass.states.async_set(entity_ids[3], "0")
+    await hass.async_block_till_done()
+
+    assert aggregates() == {
+        "min": "0.0",
+        "max": "70.0",
+        "mean": "25.0",
+        "median": "15.0",
+        "count": "4",
+    }
+    assert hass.states.get("binary_sensor.test_numeric").state == "on"
+
+    # Entities leaving the label leave the aggregates
+    for entity_id in entity_ids[1:]:
+        entity_registry.async_update_entity(entity_id, labels=set())
+    await hass.async_block_till_done()
+
+    assert aggregates() == {
+        "min": "10.0",
+        "max": "10.0",
+        "mean": "10.0",
+        "median": "10.0",
+        "count": "1",
+    }
+
+    entity_registry.async_update_entity(entity_ids[0], labels=set())
+    await hass.async_block_till_done()
+
+    assert aggregates() == {
+        "min": "unknown",
+        "max": "unknown",
+        "mean": "unknown",
+        "median": "unknown",
+        "count": "0",
+    }
+
+
+async def test_aggregate_sensors_non_finite(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test nan and inf states are left out of the aggregates."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index, value in enumerate(["1", "2", "nan"]):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, value)
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_numeric",
+            "label": test_label.label_id,
+            "state_type": "numeric_state",
+            "state_upper_limit": 50,
+            "aggregates": ["min", "mean", "count"],
+        },
+        title="test_numeric",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    def aggregates() -> dict[str, str]:
+        return {
+            aggregate: hass.states.get(f"sensor.test_numeric_{aggregate}").state
+            for aggregate in ("min", "mean", "count")
+        }
+
+    expected = {"min": "1.0", "mean": "1.5", "count": "2"}
+    assert aggregates() == expected
+
+    for value in ("nan", "inf", "-inf"):
+        hass.states.async_set(entity_ids[2], value, {"changed": value})
+        await hass.async_block_till_done()
+        assert aggregates() == expected
+
+
+async def test_aggregate_sensors_not_selected(
+    hass: HomeAssistant,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test only the selected aggregates are created."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_numeric",
+            "label": test_label.label_id,
+            "state_type": "numeric_state",
+            "state_upper_limit": 50,
+            "aggregates": ["max"],
+        },
+        title="test_numeric",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test_numeric_max").state == "unknown"
+    assert hass.states.get("sensor.test_numeric_min") is None
+
+
+async def test_match_count_sensor(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the count of matching entities."""
+
+    test_label = label_registry.async_create(
+        "test",
+    )
+
+    entity_ids = []
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, "unavailable")
+        entity_ids.append(entity_entry.entity_id)
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": "unavailable",
+        },
+        title="test_state",
+    )
+
+    await setup_integration(hass, config)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test_state_matching_entities").state == "3"
+
+    hass.states.async_set(entity_ids[0], "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test_state_matching_entities").state == "2"
+
+    entity_registry.async_update_entity(entity_ids[1], labels=set())
+    hass.states.async_set(entity_ids[2], "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.test_state_matching_entities").state == "0"
+    assert hass.states.get("binary_sensor.test_state").state == "off"
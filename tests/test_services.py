@@ -0,0 +1,148 @@
+"""The test for the label_state services."""
+
+from datetime import UTC, datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, label_registry as lr
+
+from . import setup_integration
+
+MATCHED_AT = datetime(2025, 1, 1, 12, 0, tzinfo=UTC)
+
+
+async def test_get_matches(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test getting the matches of several sensors, a page at a time."""
+
+    freezer.move_to(MATCHED_AT)
+    test_label = label_registry.async_create("test")
+
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+        hass.states.async_set(entity_entry.entity_id, str(index * 10))
+    await hass.async_block_till_done()
+
+    # Entities matching when the sensors are set up match since their change
+    freezer.tick(timedelta(hours=1))
+
+    for name, options in (
+        ("low", {"state_type": "numeric_state", "state_lower_limit": 15}),
+        ("high", {"state_type": "numeric_state", "state_upper_limit": 15}),
+    ):
+        config = MockConfigEntry(
+            domain="label_state",
+            data={},
+            options={"name": name, "label": test_label.label_id} | options,
+            title=name,
+        )
+        await setup_integration(hass, config)
+
+    response = await hass.services.async_call(
+        "label_state",
+        "get_matches",
+        {"entity_id": ["binary_sensor.low", "binary_sensor.high"], "limit": 1},
+        blocking=True,
+        return_response=True,
+    )
+    assert response == {
+        "binary_sensor.low": {
+            "entity_count": 2,
+            "matches": [
+                {
+                    "entity_id": "sensor.test_0",
+                    "name": "sensor.test_0",
+                    "value": 0.0,
+                    "since": MATCHED_AT.isoformat(),
+                }
+            ],
+        },
+        "binary_sensor.high": {
+            "entity_count": 1,
+            "matches": [
+                {
+                    "entity_id": "sensor.test_2",
+                    "name": "sensor.test_2",
+                    "value": 20.0,
+                    "since": MATCHED_AT.isoformat(),
+                }
+            ],
+        },
+    }
+
+    # The next page
+    response = await hass.services.async_call(
+        "label_state",
+        "get_matches",
+        {"entity_id": "binary_sensor.low", "offset": 1, "limit": 1},
+        blocking=True,
+        return_response=True,
+    )
+    assert [
+        match["entity_id"] for match in response["binary_sensor.low"]["matches"]
+    ] == ["sensor.test_1"]
+
+
+async def test_get_matches_raw_value(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test the matches hold the unfolded state and when they changed to it."""
+
+    freezer.move_to(MATCHED_AT)
+    test_label = label_registry.async_create("test")
+
+    entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test", "unique_0", suggested_object_id="test_0"
+    )
+    entity_registry.async_update_entity(
+        entity_entry.entity_id, labels={test_label.label_id}
+    )
+    hass.states.async_set("sensor.test_0", "Open")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": ["jammed*"],
+        },
+        title="test_state",
+    )
+    await setup_integration(hass, config)
+
+    freezer.tick(timedelta(minutes=5))
+    hass.states.async_set("sensor.test_0", "Jammed")
+    await hass.async_block_till_done()
+
+    response = await hass.services.async_call(
+        "label_state",
+        "get_matches",
+        {"entity_id": "binary_sensor.test_state"},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["binary_sensor.test_state"]["matches"] == [
+        {
+            "entity_id": "sensor.test_0",
+            "name": "sensor.test_0",
+            "value": "Jammed",
+            "since": (MATCHED_AT + timedelta(minutes=5)).isoformat(),
+        }
+    ]
@@ -0,0 +1,162 @@
+"""The test for the label_state websocket API."""
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.typing import WebSocketGenerator
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er, label_registry as lr
+from homeassistant.setup import async_setup_component
+
+from . import setup_integration
+
+
+async def test_subscribe(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test subscribing to the matching entities of an entry."""
+
+    test_label = label_registry.async_create("test")
+
+    for index in range(3):
+        entity_entry = entity_registry.async_get_or_create(
+            "sensor", "test", f"unique_{index}", suggested_object_id=f"test_{index}"
+        )
+        entity_registry.async_update_entity(
+            entity_entry.entity_id, labels={test_label.label_id}
+        )
+    hass.states.async_set("sensor.test_0", "unavailable")
+    hass.states.async_set("sensor.test_1", "on")
+    hass.states.async_set("sensor.test_2", "on")
+    await hass.async_block_till_done()
+
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options={
+            "name": "test_state",
+            "label": test_label.label_id,
+            "state_type": "state",
+            "state_to": ["unavailable"],
+        },
+        title="test_state",
+    )
+    await setup_integration(hass, config)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": "label_state/subscribe", "entry_id": config.entry_id}
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+
+    msg = await client.receive_json()
+    assert msg["event"] == {"entities": {"sensor.test_0": "sensor.test_0"}}
+
+    # Only the changes are sent
+    hass.states.async_set("sensor.test_0", "on")
+    hass.states.async_set("sensor.test_1", "unavailable")
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert msg["event"] == {"add": {}, "remove": ["sensor.test_0"]}
+    msg = await client.receive_json()
+    assert msg["event"] == {"add": {"sensor.test_1": "sensor.test_1"}, "remove": []}
+
+    # Changes that leave the match set as it was are not sent
+    hass.states.async_set("sensor.test_2", "off")
+    hass.states.async_set("sensor.test_1", "unavailable", {"changed": True})
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.test_2", "unavailable")
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert msg["event"] == {"add": {"sensor.test_2": "sensor.test_2"}, "remove": []}
+
+
+async def test_subscribe_ends_on_reload(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    entity_registry: er.EntityRegistry,
+    label_registry: lr.LabelRegistry,
+) -> None:
+    """Test a subscription ends when its entry reloads and can be renewed."""
+
+    test_label = label_registry.async_create("test")
+
+    entity_entry = entity_registry.async_get_or_create(
+        "sensor", "test", "unique_0", suggested_object_id="test_0"
+    )
+    entity_registry.async_update_entity(
+        entity_entry.entity_id, labels={test_label.label_id}
+    )
+    hass.states.async_set("sensor.test_0", "on")
+    await hass.async_block_till_done()
+
+    options = {
+        "name": "test_state",
+        "label": test_label.label_id,
+        "state_type": "state",
+        "state_to": ["unavailable"],
+    }
+    config = MockConfigEntry(
+        domain="label_state",
+        data={},
+        options=options,
+        title="test_state",
+    )
+    await setup_integration(hass, config)
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": "label_state/subscribe", "entry_id": config.entry_id}
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert msg["event"] == {"entities": {}}
+
+    # Changing the options reloads the entry, ending the subscription
+    hass.config_entries.async_update_entry(
+        config, options=options | {"state_to": ["unavailable", "off"]}
+    )
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"
+
+    # A new subscription follows the reloaded entry
+    await client.send_json_auto_id(
+        {"type": "label_state/subscribe", "entry_id": config.entry_id}
+    )
+    msg = await client.receive_json()
+    assert msg["success"]
+    msg = await client.receive_json()
+    assert msg["event"] == {"entities": {}}
+
+    hass.states.async_set("sensor.test_0", "off")
+    await hass.async_block_till_done()
+
+    msg = await client.receive_json()
+    assert msg["event"] == {"add": {"sensor.test_0": "sensor.test_0"}, "remove": []}
+
+
+async def test_subscribe_unknown_entry(
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test subscribing to an entry that does not exist."""
+
+    assert await async_setup_component(hass, "label_state", {})
+
+    client = await hass_ws_client(hass)
+    await client.send_json_auto_id(
+        {"type": "label_state/subscribe", "entry_id": "unknown"}
+    )
+    msg = await client.receive_json()
+    assert not msg["success"]
+    assert msg["error"]["code"] == "not_found"